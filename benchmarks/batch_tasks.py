@@ -0,0 +1,77 @@
+"""
+Пачечные операции с задачами против поштучных через CrudRepository на 1k и 10k задач.
+Нужны рабочие Postgres и Redis из .env, задачи создаются у временного пользователя.
+
+    python -m benchmarks.batch_tasks --sizes 1000 10000
+"""
+from datetime import date
+from uuid import uuid4
+import argparse
+import asyncio
+import time
+
+from src.api.models.task import TaskCreate, TaskUpdate, TaskBatchUpdate
+from src.api.models.user import UserCreateToDatabase
+from src.db.core import async_session_maker
+from src.repositories.task import TaskRepository
+from src.repositories.user import UserRepository
+from src.utils.redis import init_redis, close_redis
+
+
+async def timed(name: str, size: int, coro):
+    started = time.perf_counter()
+    result = await coro
+    seconds = time.perf_counter() - started
+    print(f"{name:>22} x{size:<6}: {seconds:8.2f} s, {size / seconds:9.0f} items/s")
+    return result
+
+
+async def one_by_one_create(repo: TaskRepository, tasks: list[TaskCreate]) -> list:
+    return [(await repo.create(task)).id for task in tasks]
+
+
+async def one_by_one_update(repo: TaskRepository, ids: list):
+    for id in ids:
+        await repo.update(id, TaskUpdate(name="updated"))
+
+
+async def one_by_one_delete(repo: TaskRepository, ids: list):
+    for id in ids:
+        await repo.delete(id)
+
+
+async def run(redis, operation, items):
+    async with async_session_maker() as session:
+        return await operation(TaskRepository(session, redis), items)
+
+
+async def main(sizes: list[int]):
+    redis = await init_redis()
+    async with async_session_maker() as session:
+        name = f"bench-{uuid4().hex[:8]}"
+        owner = await UserRepository(session, redis).create(UserCreateToDatabase(
+            name=name, surname="Bench", email=f"{name}@example.com", birthdate=date(2000, 1, 1), hashed_password="-",
+        ))
+        owner_id = owner.id
+
+    for size in sizes:
+        tasks = [TaskCreate(name=f"task {i}", owner_id=owner_id) for i in range(size)]
+        ids = await timed("create one by one", size, run(redis, one_by_one_create, tasks))
+        await timed("update one by one", size, run(redis, one_by_one_update, ids))
+        await timed("delete one by one", size, run(redis, one_by_one_delete, ids))
+
+        created = await timed("create batch", size, run(redis, TaskRepository.create_many, tasks))
+        ids = [result.item.id for result in created]
+        updates = [TaskBatchUpdate(id=id, name="updated") for id in ids]
+        await timed("update batch", size, run(redis, TaskRepository.update_many, updates))
+        await timed("delete batch", size, run(redis, TaskRepository.delete_many, ids))
+
+    async with async_session_maker() as session:
+        await UserRepository(session, redis).delete(owner_id)
+    await close_redis()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    asyncio.run(main(parser.parse_args().sizes))
@@ -0,0 +1,94 @@
+"""
+Сколько соединений из пула берут запросы, на которые отвечает кэш: GET /tasks/{id} и авторизованный GET /tasks/my.
+Приложение запускается в процессе через ASGITransport, чтобы читать счетчики пула; нужны рабочие Postgres и Redis.
+Для сравнения та же нагрузка по несуществующей задаче, которая каждый раз идет в базу.
+
+    python -m benchmarks.cache_hit_sessions --requests 2000 --concurrency 50
+"""
+from sqlalchemy import event
+from uuid import uuid4
+import argparse
+import asyncio
+import time
+import httpx
+
+from main import app
+from src.db.core import engine
+from src.settings import GLOBAL_PREFIX
+
+
+PASSWORD = "12345678Qw."
+
+
+class PoolProbe:
+    """Считает выдачи соединений из пула и максимум одновременно занятых за фазу."""
+
+    def __init__(self):
+        self.checkouts = 0
+        self.peak = 0
+        event.listen(engine.sync_engine, "checkout", self.on_checkout)
+
+    def on_checkout(self, *args):
+        self.checkouts += 1
+        self.peak = max(self.peak, engine.pool.checkedout())
+
+    def reset(self):
+        self.checkouts = 0
+        self.peak = 0
+
+
+async def prepare(client: httpx.AsyncClient) -> tuple[dict, str]:
+    name = f"bench-{uuid4().hex[:8]}"
+    user = await client.post(f"{GLOBAL_PREFIX}/users/", json={
+        "name": name,
+        "surname": "Bench",
+        "email": f"{name}@example.com",
+        "birthdate": "2000-01-01",
+        "password": PASSWORD,
+    })
+    user.raise_for_status()
+    login = await client.post(f"{GLOBAL_PREFIX}/auth/login", data={"username": name, "password": PASSWORD})
+    login.raise_for_status()
+    headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+    task = await client.post(f"{GLOBAL_PREFIX}/tasks/", json={"name": "bench task", "owner_id": user.json()["id"]})
+    task.raise_for_status()
+    return headers, task.json()["id"]
+
+
+async def run(client: httpx.AsyncClient, probe: PoolProbe, name: str, url: str, headers: dict, requests: int, concurrency: int):
+    await client.get(url, headers=headers)
+    probe.reset()
+    queue = iter(range(requests))
+    statuses = {}
+
+    async def worker():
+        for _ in queue:
+            response = await client.get(url, headers=headers)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    print(
+        f"{name:>16}: {requests / elapsed:8.0f} req/s, pool checkouts {probe.checkouts:6}, "
+        f"peak checked out {probe.peak:3}, statuses {statuses}"
+    )
+
+
+async def main(requests: int, concurrency: int):
+    probe = PoolProbe()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            headers, task_id = await prepare(client)
+            await run(client, probe, "task cache hit", f"{GLOBAL_PREFIX}/tasks/{task_id}", {}, requests, concurrency)
+            await run(client, probe, "my tasks cached", f"{GLOBAL_PREFIX}/tasks/my", headers, requests, concurrency)
+            await run(client, probe, "task not found", f"{GLOBAL_PREFIX}/tasks/{uuid4()}", {}, requests, concurrency)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, args.concurrency))
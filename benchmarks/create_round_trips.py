@@ -0,0 +1,112 @@
+"""
+POST /users/ и POST /tasks/: обращения к базе и время на запрос до и после перехода на INSERT ... RETURNING.
+"До" воспроизводит прежнюю схему: SELECT-проверка уникальности для пользователя, затем add, commit и refresh.
+Приложение запускается в процессе через ASGITransport; нужны рабочие Postgres и Redis.
+
+    python -m benchmarks.create_round_trips --requests 200
+"""
+from sqlalchemy import event, select
+from contextlib import contextmanager, nullcontext
+from uuid import uuid4
+import argparse
+import asyncio
+import time
+import httpx
+
+from main import app
+from src.db.core import engine
+from src.db import User
+from src.exc.api import AlreadyExistsException
+from src.repositories.base.crud import CrudRepository
+from src.repositories.user import UserRepository
+from src.settings import GLOBAL_PREFIX
+
+
+PASSWORD = "12345678Qw."
+
+
+async def legacy_create(self, model_create):
+    new_model = self.model(**model_create.model_dump(exclude_unset=True))
+    self.session.add(new_model)
+    await self.session.commit()
+    await self.session.refresh(new_model)
+    model = self.response_model.model_validate(new_model)
+    await self._cache_write(model)
+    await self._bump_list_generations(self._scope_of(model))
+    await self._count(self._deltas(added=[model]))
+    return model
+
+
+async def legacy_user_create(self, model_create):
+    existing = await self.session.scalar(
+        select(User).where((User.email == model_create.email) | (User.name == model_create.name))
+    )
+    if existing:
+        raise AlreadyExistsException(detail="Пользователь с такой почтой или именем уже существует")
+    return await legacy_create(self, model_create)
+
+
+@contextmanager
+def legacy_creates():
+    create, user_create = CrudRepository.create, UserRepository.create
+    CrudRepository.create, UserRepository.create = legacy_create, legacy_user_create
+    try:
+        yield
+    finally:
+        CrudRepository.create, UserRepository.create = create, user_create
+
+
+class RoundTrips:
+    """Считает выражения, BEGIN и COMMIT, то есть обращения к Postgres."""
+
+    def __init__(self):
+        self.count = 0
+        for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+            event.listen(engine.sync_engine, name, self.hit)
+
+    def hit(self, *args, **kwargs):
+        self.count += 1
+
+
+async def run(client: httpx.AsyncClient, trips: RoundTrips, name: str, make_request, requests: int):
+    trips.count = 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        response = await make_request()
+        response.raise_for_status()
+    elapsed = time.perf_counter() - started
+    print(f"{name:>22}: {trips.count / requests:5.1f} round trips, {elapsed / requests * 1000:7.2f} ms per request")
+
+
+async def main(requests: int):
+    trips = RoundTrips()
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+
+            def create_user():
+                name = f"bench-{uuid4().hex[:12]}"
+                return client.post(f"{GLOBAL_PREFIX}/users/", json={
+                    "name": name,
+                    "surname": "Bench",
+                    "email": f"{name}@example.com",
+                    "birthdate": "2000-01-01",
+                    "password": PASSWORD,
+                })
+
+            owner = (await create_user()).json()["id"]
+
+            def create_task():
+                return client.post(f"{GLOBAL_PREFIX}/tasks/", json={"name": "bench task", "owner_id": owner})
+
+            for label, patch in (("before", legacy_creates), ("after", nullcontext)):
+                with patch():
+                    await run(client, trips, f"POST /users/ {label}", create_user, requests)
+                    await run(client, trips, f"POST /tasks/ {label}", create_task, requests)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,77 @@
+"""
+Страница из 500 задач: ответ через response_model против ModelResponse без повторной валидации.
+Маршруты собираются на отдельном FastAPI-приложении и вызываются через ASGITransport, база и Redis не нужны.
+"orm" повторяет прежний get_list с объектами ORM, "models" прежний get, "cached" отдачу готового JSON из кэша списков.
+
+    python -m benchmarks.json_responses --items 500 --requests 500
+"""
+from fastapi import FastAPI
+from pydantic_core import to_json
+from uuid import uuid4
+import argparse
+import asyncio
+import logging
+import time
+import httpx
+
+from src.api.models.task import TaskResponse
+from src.db import Task
+from src.utils.enums import TaskStatusEnum
+from src.utils.responses import ModelResponse
+
+
+def build_app(items: int) -> FastAPI:
+    owner_id = uuid4()
+    rows = [
+        Task(id=uuid4(), name=f"task {i}", description="описание " * 20, status=TaskStatusEnum.IN_WORK, owner_id=owner_id)
+        for i in range(items)
+    ]
+    models = [TaskResponse.model_validate(row) for row in rows]
+    body = to_json(models).decode()
+    app = FastAPI()
+
+    @app.get("/orm", response_model=list[TaskResponse])
+    async def orm():
+        return rows
+
+    @app.get("/models", response_model=list[TaskResponse])
+    async def validated():
+        return models
+
+    @app.get("/orm-fast", response_model=list[TaskResponse])
+    async def orm_fast():
+        return ModelResponse([TaskResponse.model_validate(row) for row in rows])
+
+    @app.get("/models-fast", response_model=list[TaskResponse])
+    async def models_fast():
+        return ModelResponse(models)
+
+    @app.get("/cached", response_model=list[TaskResponse])
+    async def cached():
+        return ModelResponse(body)
+
+    return app
+
+
+async def main(items: int, requests: int):
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    transport = httpx.ASGITransport(app=build_app(items))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        expected = None
+        for path in ("/orm", "/models", "/orm-fast", "/models-fast", "/cached"):
+            response = await client.get(path)
+            expected = expected or response.json()
+            assert response.json() == expected, path
+            started = time.perf_counter()
+            for _ in range(requests):
+                await client.get(path)
+            elapsed = time.perf_counter() - started
+            print(f"{path:>12}: {elapsed / requests * 1000:7.2f} ms per page, {len(response.content):7} bytes")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.requests))
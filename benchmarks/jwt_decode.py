@@ -0,0 +1,69 @@
+"""
+Стоимость подписи и проверки токена на один запрос: чтение и разбор PEM на каждый вызов
+(как раньше делали encode_jwt и decode_jwt) против ключей из KeyRing.
+
+    python -m benchmarks.jwt_decode
+"""
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from tempfile import TemporaryDirectory
+from pathlib import Path
+import timeit
+import jwt
+
+from src.settings.environment import AuthJWT
+from src.auth.keys import KeyRing
+
+
+ROUNDS = 500
+
+
+def write_keys(directory: Path) -> AuthJWT:
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path, public_path = directory / "private.pem", directory / "public.pem"
+    private_path.write_bytes(private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.TraditionalOpenSSL,
+        encryption_algorithm=serialization.NoEncryption(),
+    ))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PublicFormat.SubjectPublicKeyInfo,
+    ))
+    return AuthJWT(private_key=private_path, public_key=public_path, rotated_keys_dir=directory / "rotated")
+
+
+def main():
+    with TemporaryDirectory() as tmp:
+        config = write_keys(Path(tmp))
+        ring = KeyRing(config)
+        kid, private_key = ring.signing()
+        token = jwt.encode({"sub": "bench", "type": "access"}, private_key, config.algorithm, headers={"kid": kid})
+
+        def decode_before():
+            return jwt.decode(token, config.load_public(), algorithms=[config.algorithm])
+
+        def decode_after():
+            header_kid = jwt.get_unverified_header(token)["kid"]
+            return jwt.decode(token, ring.verification_key(header_kid), algorithms=[config.algorithm])
+
+        def encode_before():
+            return jwt.encode({"sub": "bench"}, config.load_private(), config.algorithm)
+
+        def encode_after():
+            kid, key = ring.signing()
+            return jwt.encode({"sub": "bench"}, key, config.algorithm, headers={"kid": kid})
+
+        cases = (
+            ("decode, PEM per request", decode_before),
+            ("decode, key ring", decode_after),
+            ("encode, PEM per request", encode_before),
+            ("encode, key ring", encode_after),
+        )
+        for name, func in cases:
+            seconds = min(timeit.repeat(func, number=ROUNDS, repeat=3))
+            print(f"{name:>24}: {seconds / ROUNDS * 1e6:8.1f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Нагрузочный тест: p99 задержки GET /tasks/{id} в покое и во время шторма логинов.
+Запускается против поднятого сервера (uvicorn main:app) с рабочими Postgres и Redis.
+
+    python -m benchmarks.login_storm --base-url http://localhost:8000 --seconds 10 --logins 64
+"""
+from uuid import uuid4
+import argparse
+import asyncio
+import statistics
+import time
+import httpx
+
+from src.settings import GLOBAL_PREFIX
+
+
+PASSWORD = "12345678Qw."
+
+
+async def prepare(client: httpx.AsyncClient) -> tuple[str, str]:
+    name = f"storm-{uuid4().hex[:8]}"
+    user = await client.post(f"{GLOBAL_PREFIX}/users/", json={
+        "name": name,
+        "surname": "Storm",
+        "email": f"{name}@example.com",
+        "birthdate": "2000-01-01",
+        "password": PASSWORD,
+    })
+    user.raise_for_status()
+    task = await client.post(f"{GLOBAL_PREFIX}/tasks/", json={"name": "storm task", "owner_id": user.json()["id"]})
+    task.raise_for_status()
+    return name, task.json()["id"]
+
+
+async def measure_reads(client: httpx.AsyncClient, task_id: str, seconds: float) -> list[float]:
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        response = await client.get(f"{GLOBAL_PREFIX}/tasks/{task_id}")
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - started)
+    return latencies
+
+
+async def login_storm(client: httpx.AsyncClient, username: str, seconds: float, concurrency: int) -> dict:
+    codes = {}
+    deadline = time.perf_counter() + seconds
+
+    async def worker():
+        while time.perf_counter() < deadline:
+            response = await client.post(f"{GLOBAL_PREFIX}/auth/login", data={"username": username, "password": PASSWORD})
+            codes[response.status_code] = codes.get(response.status_code, 0) + 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return codes
+
+
+def report(name: str, latencies: list[float]):
+    p50 = statistics.median(latencies) * 1000
+    p99 = statistics.quantiles(latencies, n=100)[98] * 1000
+    print(f"{name:>14}: {len(latencies):6} requests, p50 {p50:7.2f} ms, p99 {p99:7.2f} ms")
+
+
+async def main(base_url: str, seconds: float, logins: int):
+    limits = httpx.Limits(max_connections=logins + 8)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30) as client:
+        username, task_id = await prepare(client)
+        await measure_reads(client, task_id, 1)
+
+        report("idle", await measure_reads(client, task_id, seconds))
+        reads, codes = await asyncio.gather(
+            measure_reads(client, task_id, seconds),
+            login_storm(client, username, seconds, logins),
+        )
+        report("login storm", reads)
+        print(f"{'login codes':>14}: {codes}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--logins", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(main(args.base_url, args.seconds, args.logins))
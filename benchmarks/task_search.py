@@ -0,0 +1,106 @@
+"""
+Полнотекстовый поиск задач на 1M строк: GET /tasks/search через TaskRepository.search против ILIKE по name и description.
+Строки создаются одним INSERT ... SELECT generate_series у временного пользователя и удаляются в конце.
+Нужен рабочий Postgres из .env с примененными миграциями.
+
+    python -m benchmarks.task_search --rows 1000000 --repeats 20
+"""
+from sqlalchemy import text, select, delete, or_
+from datetime import date
+from uuid import uuid4
+import argparse
+import asyncio
+import statistics
+import time
+
+from src.api.models.pagination import CursorPage
+from src.api.models.task import TaskResponse
+from src.db.core import async_session_maker
+from src.db import Task, User
+from src.repositories.task import TaskRepository
+
+
+WORDS = [
+    "купить", "молоко", "хлеб", "починить", "кран", "отчет", "квартальный", "позвонить", "клиенту", "встреча",
+    "релиз", "сервер", "обновить", "документацию", "проверить", "счет", "оплатить", "аренду", "подготовить", "презентацию",
+]
+QUERIES = ["молоко", "отчет квартал", "позв клиент", "сервер релиз обнов"]
+
+SEED = text("""
+    INSERT INTO tasks (id, name, description, status, owner_id)
+    SELECT gen_random_uuid(),
+           w[1 + (i * 7) % 20] || ' ' || w[1 + (i * 13) % 20] || ' ' || i,
+           w[1 + (i * 3) % 20] || ' ' || w[1 + (i * 11) % 20] || ' ' || w[1 + (i * 17) % 20],
+           'CREATED',
+           :owner_id
+    FROM generate_series(1, :rows) AS i, (SELECT CAST(:words AS text[]) AS w) AS words
+""")
+
+
+async def timed(repeats: int, run) -> list[float]:
+    timings = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        await run()
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+
+def top(page: CursorPage[TaskResponse], count: int = 3) -> str:
+    return ", ".join(task.name for task in page.items[:count])
+
+
+def report(name: str, timings: list[float]):
+    timings = sorted(timings)
+    p95 = timings[max(int(len(timings) * 0.95) - 1, 0)]
+    print(f"{name:>34}: p50 {statistics.median(timings):8.2f} ms, p95 {p95:8.2f} ms")
+
+
+async def main(rows: int, repeats: int):
+    owner_id = uuid4()
+    async with async_session_maker() as session:
+        session.add(User(
+            id=owner_id, name=f"bench-{owner_id.hex[:8]}", surname="Bench", email=f"{owner_id.hex[:8]}@example.com",
+            hashed_password="-", birthdate=date(2000, 1, 1),
+        ))
+        await session.commit()
+        started = time.perf_counter()
+        await session.execute(SEED, {"owner_id": owner_id, "rows": rows, "words": WORDS})
+        await session.commit()
+        await session.execute(text("ANALYZE tasks"))
+        print(f"seeded {rows} tasks in {time.perf_counter() - started:.1f} s")
+
+    try:
+        async with async_session_maker() as session:
+            repo = TaskRepository(session, None)
+            for q in QUERIES:
+                page = await repo.search(q, 50)
+                print(f"{q!r}: {top(page)}")
+                report(f"search {q!r}", await timed(repeats, lambda: repo.search(q, 50)))
+                if page.next_cursor:
+                    report(f"search {q!r} page 2", await timed(repeats, lambda: repo.search(q, 50, page.next_cursor)))
+                report(f"search {q!r} own", await timed(repeats, lambda: repo.search(q, 50, owner_id=owner_id)))
+
+                patterns = [f"%{word}%" for word in q.split()]
+                ilike = select(Task).where(*(
+                    or_(Task.name.ilike(pattern), Task.description.ilike(pattern)) for pattern in patterns
+                )).limit(50)
+                report(f"ilike {q!r}", await timed(repeats, lambda: session.scalars(ilike)))
+
+            plan = await session.execute(
+                text("EXPLAIN SELECT id FROM tasks WHERE search_vector @@ to_tsquery('russian', 'молок:*')")
+            )
+            print("\n".join(row[0] for row in plan))
+    finally:
+        async with async_session_maker() as session:
+            await session.execute(delete(Task).where(Task.owner_id == owner_id))
+            await session.execute(delete(User).where(User.id == owner_id))
+            await session.commit()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.repeats))
@@ -0,0 +1,72 @@
+"""
+Вставка в таблицу с первичным ключом UUID: uuid4 против uuid7 на 10M строк.
+Для каждой версии создается отдельная таблица, строки идут через COPY пачками, ключи генерируются в Python, как в приложении.
+Печатается скорость по ходу заполнения, размер индекса первичного ключа и доля плотно заполненных страниц индекса.
+Нужен рабочий Postgres из .env, таблицы bench_ids_* удаляются в конце.
+
+    python -m benchmarks.uuid_keys --rows 10000000 --batch 100000
+"""
+from uuid import uuid4
+import argparse
+import asyncio
+import time
+
+from src.db.core import engine
+from src.utils.ids import uuid7
+
+
+GENERATORS = {"v4": uuid4, "v7": uuid7}
+PAYLOAD = "x" * 100
+
+
+async def fill(driver, table: str, generate, rows: int, batch: int):
+    await driver.execute(f"DROP TABLE IF EXISTS {table}")
+    await driver.execute(f"CREATE TABLE {table} (id uuid PRIMARY KEY, payload text NOT NULL)")
+    started = time.perf_counter()
+    report_every = max(rows // 10, batch)
+    window_started, window_rows = started, 0
+    for done in range(0, rows, batch):
+        records = [(generate(), PAYLOAD) for _ in range(min(batch, rows - done))]
+        await driver.copy_records_to_table(table, records=records, columns=["id", "payload"])
+        window_rows += len(records)
+        if (done + len(records)) % report_every == 0 or done + len(records) == rows:
+            now = time.perf_counter()
+            print(f"{table:>13}: {done + len(records):>10} rows, {window_rows / (now - window_started):9.0f} rows/s")
+            window_started, window_rows = now, 0
+    total = time.perf_counter() - started
+    index_size = await driver.fetchval(f"SELECT pg_relation_size('{table}_pkey')")
+    table_size = await driver.fetchval(f"SELECT pg_relation_size('{table}')")
+    print(
+        f"{table:>13}: {rows / total:9.0f} rows/s overall, pk index {index_size / 2**20:8.1f} MiB, "
+        f"table {table_size / 2**20:8.1f} MiB"
+    )
+    # pgstattuple есть не везде; без него только размеры
+    try:
+        density = await driver.fetchval(f"SELECT avg_leaf_density FROM pgstatindex('{table}_pkey')")
+        print(f"{table:>13}: leaf density {density:5.1f}%")
+    except Exception:
+        pass
+
+
+async def main(rows: int, batch: int):
+    async with engine.connect() as conn:
+        driver = (await conn.get_raw_connection()).driver_connection
+        try:
+            await driver.execute("CREATE EXTENSION IF NOT EXISTS pgstattuple")
+        except Exception:
+            pass
+        try:
+            for name, generate in GENERATORS.items():
+                await fill(driver, f"bench_ids_{name}", generate, rows, batch)
+        finally:
+            for name in GENERATORS:
+                await driver.execute(f"DROP TABLE IF EXISTS bench_ids_{name}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--batch", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(main(args.rows, args.batch))
@@ -1,17 +1,35 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from contextlib import asynccontextmanager
+import asyncio
 import uvicorn
 
-from src.api import task_router, user_router, auth_router
-from src.settings import GLOBAL_PREFIX
+from src.api import task_router, user_router, auth_router, monitoring_router
+from src.settings import GLOBAL_PREFIX, settings
 from src.tasks.config import broker
+from src.utils.redis import init_redis, close_redis
+from src.auth.keys import install_reload_signal
+from src.auth.hash import hashing_pool
+from src.cache import object_cache
+from src.db.core import engine
+from src.db.pool import warm_up
+from src.db.replicas import replicas, stick_to_primary
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    redis = await init_redis()
+    object_cache.start(redis)
+    replicas.start()
+    if settings.DB_POOL_WARMUP:
+        await asyncio.gather(warm_up(engine), *(warm_up(replica) for replica in replicas.engines))
+    install_reload_signal()
     if not broker.is_worker_process:
         await broker.startup()
     yield
     await broker.shutdown()
+    await object_cache.stop()
+    await replicas.stop()
+    await close_redis()
+    hashing_pool.shutdown()
 
 app = FastAPI(
     version="1.0",
@@ -21,9 +39,18 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+
+@app.middleware("http")
+async def primary_after_write(request: Request, call_next):
+    response = await call_next(request)
+    if replicas.enabled and request.method not in ("GET", "HEAD", "OPTIONS") and response.status_code < 400:
+        stick_to_primary(response)
+    return response
+
 app.include_router(task_router, prefix=GLOBAL_PREFIX)
 app.include_router(user_router, prefix=GLOBAL_PREFIX)
 app.include_router(auth_router, prefix=GLOBAL_PREFIX)
+app.include_router(monitoring_router, prefix=GLOBAL_PREFIX)
 
 if __name__=="__main__":
     uvicorn.run(app, host="0.0.0.0")
\ No newline at end of file
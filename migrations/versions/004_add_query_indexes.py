@@ -0,0 +1,40 @@
+"""add indexes for task and user queries
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '004'
+down_revision: Union[str, Sequence[str], None] = '003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Индексы строятся CONCURRENTLY, чтобы не блокировать запись в рабочие таблицы.
+    Перед миграцией в users не должно быть повторяющихся name, иначе уникальный индекс не создастся.
+    """
+    with op.get_context().autocommit_block():
+        op.create_index('ix_tasks_owner_id_status_id', 'tasks', ['owner_id', 'status', 'id'], postgresql_concurrently=True)
+        op.create_index('ix_tasks_status_id', 'tasks', ['status', 'id'], postgresql_concurrently=True)
+        op.create_index('ix_tasks_name_id', 'tasks', ['name', 'id'], postgresql_concurrently=True)
+        op.create_index(op.f('ix_users_name'), 'users', ['name'], unique=True, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_users_name'), table_name='users', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_name_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_status_id', table_name='tasks', postgresql_concurrently=True)
+        op.drop_index('ix_tasks_owner_id_status_id', table_name='tasks', postgresql_concurrently=True)
@@ -0,0 +1,52 @@
+"""add full-text search vector for tasks
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '005'
+down_revision: Union[str, Sequence[str], None] = '004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SEARCH_VECTOR = (
+    "setweight(to_tsvector('russian', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('russian', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Колонка генерируется самой базой и пересчитывается при каждом изменении name или description.
+    Добавление STORED-колонки переписывает таблицу под эксклюзивной блокировкой, на большой tasks
+    миграцию нужно запускать в окно обслуживания. GIN-индекс затем строится CONCURRENTLY.
+    """
+    op.add_column('tasks', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(SEARCH_VECTOR, persisted=True),
+        nullable=True,
+    ))
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_tasks_search_vector', 'tasks', ['search_vector'],
+            postgresql_using='gin', postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_tasks_search_vector', table_name='tasks', postgresql_concurrently=True)
+    op.drop_column('tasks', 'search_vector')
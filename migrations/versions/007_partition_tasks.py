@@ -0,0 +1,61 @@
+"""hash-partition tasks by owner_id
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+from src.db.partitioning import (
+    TABLE, SHADOW, OLD, INDEXES, OLD_INDEXES, IS_PARTITIONED, SHADOW_EXISTS, COLUMNS,
+    shadow_statements, copy_all_statement, swap_statements,
+)
+from src.settings import settings
+
+
+# revision identifiers, used by Alembic.
+revision: str = '007'
+down_revision: Union[str, Sequence[str], None] = '006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema.
+
+    Переносит tasks в партиционированную таблицу одним INSERT ... SELECT под блокировкой всей таблицы.
+    Это подходит для пустой или небольшой базы. На рабочей базе сначала запускается
+    python -m src.db.partitioning: после него таблица уже партиционирована и миграция ничего не делает.
+    """
+    bind = op.get_bind()
+    if bind.scalar(IS_PARTITIONED):
+        return
+    if bind.scalar(SHADOW_EXISTS):
+        raise RuntimeError(f"{SHADOW} exists: finish python -m src.db.partitioning before upgrading")
+    columns = list(bind.scalars(COLUMNS))
+    op.execute(f"LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE")
+    for statement in shadow_statements(settings.TASK_PARTITIONS):
+        op.execute(statement)
+    op.execute(copy_all_statement(columns))
+    for statement in swap_statements():
+        op.execute(statement)
+    op.execute(f"DROP TABLE {OLD}")
+    op.execute(f"ANALYZE {TABLE}")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    columns = ", ".join(op.get_bind().scalars(COLUMNS))
+    op.execute(f"CREATE TABLE {OLD} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING GENERATED)")
+    op.execute(f"INSERT INTO {OLD} ({columns}) SELECT {columns} FROM {TABLE}")
+    op.drop_table(TABLE)
+    op.rename_table(OLD, TABLE)
+    op.create_primary_key(f'{TABLE}_pkey', TABLE, ['id'])
+    op.create_foreign_key(f'{TABLE}_owner_id_fkey', TABLE, 'users', ['owner_id'], ['id'])
+    for name in OLD_INDEXES:
+        op.create_index(name, TABLE, ['id'], unique=False)
+    for name, definition in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON {TABLE} {definition}")
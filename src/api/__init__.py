@@ -1,3 +1,4 @@
 from .endpoints.task import task_router
 from .endpoints.user import user_router
-from .endpoints.auth import auth_router
\ No newline at end of file
+from .endpoints.auth import auth_router
+from .endpoints.monitoring import monitoring_router
\ No newline at end of file
@@ -7,6 +7,7 @@ from src.api.models.user import UserResponse, UserUpdate
 from src.auth.create import create_access_token, create_verification_token, create_tokens
 from src.auth.validations import get_current_user
 from src.auth.token import decode_jwt, set_tokens_to_cookie
+from src.auth.keys import key_ring
 from src.tasks import send_verification_code_task, send_verification_link_task
 from src.mailing.verification import VERIFICATION_EMAIL_LINK
 from src.exc.api import NotFoundException
@@ -23,12 +24,11 @@ async def login(
     response: Response,
     form_data: OAuth2PasswordRequestForm = Depends(),
     repo: AuthRepository = Depends(get_auth_repo),
-    redis: Redis = Depends(get_redis)
 ):
     """Эндпоинт для входа (выдачи токенов)"""
     user = await repo.authenticate(form_data.username, form_data.password)
     if user.is_verified: 
-        await send_verification_code_task.kiq(user.email, redis)
+        await send_verification_code_task.kiq(user.email)
         verification_token = create_verification_token(user)
         set_tokens_to_cookie(response, verification_token=verification_token)
         return {"message": f"send code to {user.email}"}
@@ -99,4 +99,10 @@ async def verification_email(
         raise NotFoundException("Page")
     model_update = UserUpdate(is_verified=True)
     await repo.update(user.id, model_update)
-    return {"message": "Success verified email"}
\ No newline at end of file
+    return {"message": "Success verified email"}
+
+
+@auth_router.get("/jwks")
+async def jwks():
+    """Эндпоинт с публичными ключами для проверки JWT (JWKS)"""
+    return key_ring.jwks()
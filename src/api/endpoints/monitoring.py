@@ -0,0 +1,35 @@
+from fastapi import APIRouter
+
+from src.utils.redis import get_redis
+from src.auth.hash import hashing_pool
+from src.auth.cache import token_cache
+from src.cache import object_cache, single_flight
+from src.db.core import engine
+from src.db.replicas import replicas
+
+
+monitoring_router = APIRouter(prefix="/monitoring", tags=["Monitoring"])
+
+
+@monitoring_router.get("/redis")
+async def redis_pool_stats():
+    """Возвращает статистику общего пула соединений Redis"""
+    return get_redis().connection_pool.stats()
+
+
+@monitoring_router.get("/hashing")
+async def hashing_pool_stats():
+    """Возвращает загрузку пула хеширования паролей"""
+    return hashing_pool.stats()
+
+
+@monitoring_router.get("/cache")
+async def cache_stats():
+    """Возвращает счетчики попаданий и промахов кэшей"""
+    return {"token": token_cache.stats(), **object_cache.stats(), "single_flight": single_flight.stats()}
+
+
+@monitoring_router.get("/db")
+async def db_stats():
+    """Возвращает загрузку пулов соединений PostgreSQL, состояние и отставание реплик"""
+    return {"primary": engine.pool.stats(), **replicas.stats()}
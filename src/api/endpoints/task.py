@@ -1,38 +1,122 @@
-from fastapi import APIRouter, Depends, status
-from typing import Annotated, Optional
+from fastapi import APIRouter, Body, Depends, Header, Query, Request, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from typing import Annotated, Literal, Optional
 from uuid import UUID
 
 from src.repositories import BaseTaskRepository, TaskRepository
 from src.repositories.user import get_user_repo
 from src.repositories.task import get_task_repo
-from src.api.models.task import TaskCreate, TaskResponse, TaskUpdate
+from src.api.models.task import TaskCreate, TaskResponse, TaskSummary, TaskUpdate, TaskBatchUpdate, TaskStats
+from src.api.models.projection import parse_fields
+from src.api.models.batch import BatchItem, ImportResult
 from src.api.models.user import UserResponse
+from src.api.models.pagination import CursorPage, TOTAL_COUNT_HEADER, TotalMode
 from src.utils.enums import TaskStatusEnum
-from src.utils.redis import get_redis
-from src.db.core import get_async_session
-from src.auth.validations import get_current_user
+from src.utils.export import MEDIA_TYPES, to_csv, to_ndjson
+from src.utils.importing import iter_lines, ndjson_rows, csv_rows
+from src.utils.redis import Redis, get_redis
+from src.utils.responses import ModelResponse
+from src.utils.etag import make_etag, etag_matches, if_match_versions, not_modified
+from src.db.core import get_async_session, get_read_session_maker
+from src.auth.validations import get_current_user, get_admin
+from src.settings import settings
 
 
 task_router = APIRouter(prefix="/tasks", tags=["Tasks"])
 
 
-@task_router.get("/my")
+@task_router.get("/my", response_model=list[TaskSummary] | CursorPage[TaskSummary])
 async def owner_tasks(
     user: UserResponse = Depends(get_current_user),
-    repo: TaskRepository = Depends(get_task_repo)
+    repo: TaskRepository = Depends(get_task_repo),
+    limit: Optional[int] = 50,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    total: Optional[TotalMode] = None,
+    fields: Optional[str] = None,
 ):
     """Возвращаетс список задач авторизованного пользователя"""
-    return await repo.get_list(owner_id=user.id)
+    projection = parse_fields(TaskResponse, fields, default=TaskSummary)
+    body = await repo.get_list_json(0, limit, cursor, order_by, projection, owner_id=user.id)
+    headers = {TOTAL_COUNT_HEADER: str(await repo.count(total, owner_id=user.id))} if total else None
+    return ModelResponse(body, headers=headers)
 
-@task_router.get("/", response_model=list[TaskResponse])
+@task_router.get("/", response_model=list[TaskSummary] | CursorPage[TaskSummary])
 async def get_tasks(
     repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
     skip: Optional[int] = 0,
     limit: Optional[int] = 50,
     status: Optional[TaskStatusEnum] = None,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    total: Optional[TotalMode] = None,
+    fields: Optional[str] = None,
+):
+    """
+    Возвращает лист задач с возможностью пагинации и фильтрации по статусу.
+    Пустой cursor включает курсорную пагинацию: ответ содержит next_cursor для следующей страницы.
+    total=exact или total=estimated добавляет заголовок X-Total-Count с точным или примерным числом задач.
+    По умолчанию задачи отдаются без описания, fields=name,description выбирает поля явно (id есть всегда).
+    """
+    projection = parse_fields(TaskResponse, fields, default=TaskSummary)
+    body = await repo.get_list_json(skip, limit, cursor, order_by, projection, status=status)
+    headers = {TOTAL_COUNT_HEADER: str(await repo.count(total, status=status))} if total else None
+    return ModelResponse(body, headers=headers)
+
+
+@task_router.get("/stats", response_model=TaskStats)
+async def owner_task_stats(
+    user: Annotated[UserResponse, Depends(get_current_user)],
+    repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+):
+    """Возвращает число задач авторизованного пользователя по статусам"""
+    return await repo.get_stats(user.id)
+
+
+@task_router.get("/stats/global", response_model=TaskStats)
+async def global_task_stats(
+    admin: Annotated[UserResponse, Depends(get_admin)],
+    repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+):
+    """Возвращает число всех задач по статусам, только для администратора"""
+    return await repo.get_stats()
+
+
+@task_router.get("/search", response_model=CursorPage[TaskResponse])
+async def search_tasks(
+    repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+    q: Annotated[str, Query(min_length=1, max_length=200)],
+    limit: Optional[int] = 50,
+    cursor: Optional[str] = None,
+    status: Optional[TaskStatusEnum] = None,
+    owner_id: Optional[UUID] = None,
+):
+    """Ищет задачи по словам и их началам в названии и описании, самые релевантные первыми"""
+    return ModelResponse(await repo.search(q, limit, cursor, status=status, owner_id=owner_id))
+
+
+@task_router.get("/export", response_class=StreamingResponse)
+async def export_tasks(
+    session_maker: Annotated[async_sessionmaker[AsyncSession], Depends(get_read_session_maker)],
+    redis: Annotated[Redis, Depends(get_redis)],
+    format: Literal["ndjson", "csv"] = "ndjson",
+    status: Optional[TaskStatusEnum] = None,
+    owner_id: Optional[UUID] = None,
 ):
-    """Возвращает лист задач с возможностью пагинации и фильтрации по статусу"""
-    return await repo.get_list(skip, limit, status=status)
+    """Выгружает все задачи потоком в NDJSON или CSV, с теми же фильтрами, что и список"""
+    async def chunks():
+        # сессия открывается внутри генератора: зависимости закрываются до того, как тело ответа начнет отправляться
+        async with session_maker() as session:
+            async for chunk in TaskRepository(session, redis).stream(status=status, owner_id=owner_id):
+                yield chunk
+
+    body = to_csv(chunks(), TaskResponse) if format == "csv" else to_ndjson(chunks())
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'},
+    )
 
 
 @task_router.post("/", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
@@ -41,16 +125,69 @@ async def create_task(
     repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
 ):
     """Создает новую задачу"""
-    return await repo.create(task)
+    return ModelResponse(await repo.create(task), status.HTTP_201_CREATED)
+
+
+@task_router.post("/import", response_model=ImportResult)
+async def import_tasks(
+    request: Request,
+    repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+    format: Literal["ndjson", "csv"] = "ndjson",
+):
+    """Загружает задачи из тела запроса в NDJSON или CSV через COPY, возвращает ошибки по строкам"""
+    lines = iter_lines(request.stream())
+    rows = csv_rows(lines) if format == "csv" else ndjson_rows(lines)
+    return await repo.import_rows(rows, TaskCreate)
+
+
+@task_router.post("/batch", response_model=list[BatchItem[TaskResponse]])
+async def create_tasks_batch(
+    tasks: Annotated[list[TaskCreate], Body(min_length=1, max_length=settings.BATCH_MAX_ITEMS)],
+    repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+):
+    """Создает пачку задач в одной транзакции, возвращает результат по каждой"""
+    return ModelResponse(await repo.create_many(tasks))
+
+
+@task_router.patch("/batch", response_model=list[BatchItem[TaskResponse]])
+async def update_tasks_batch(
+    tasks: Annotated[list[TaskBatchUpdate], Body(min_length=1, max_length=settings.BATCH_MAX_ITEMS)],
+    repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+):
+    """Обновляет пачку задач в одной транзакции, возвращает результат по каждой"""
+    return ModelResponse(await repo.update_many(tasks))
+
+
+@task_router.delete("/batch", response_model=list[BatchItem[TaskResponse]])
+async def delete_tasks_batch(
+    task_ids: Annotated[list[UUID], Body(min_length=1, max_length=settings.BATCH_MAX_ITEMS)],
+    repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+):
+    """Удаляет пачку задач в одной транзакции, возвращает результат по каждой"""
+    return ModelResponse(await repo.delete_many(task_ids))
 
 
 @task_router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: UUID,
     repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+    fields: Optional[str] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    """Возвращает одну задачу"""
-    return await repo.get(task_id)
+    """
+    Возвращает одну задачу, fields оставляет в ответе только перечисленные поля.
+    If-None-Match с актуальным ETag дает 304 по версии из кэша, задача при этом не читается.
+    """
+    projection = parse_fields(TaskResponse, fields) if fields else None
+    if if_none_match:
+        version = await repo.get_version(task_id)
+        if version is not None and etag_matches(if_none_match, make_etag(version, projection)):
+            return not_modified(make_etag(version, projection))
+    task = await repo.get(task_id)
+    tag = make_etag(task.version, projection)
+    if etag_matches(if_none_match, tag):
+        return not_modified(tag)
+    return ModelResponse(projection.model_validate(task) if projection else task, headers={"ETag": tag})
 
 
 @task_router.put("/{task_id}", response_model=TaskResponse)
@@ -58,9 +195,11 @@ async def update_task(
     task_id: UUID,
     task_update: TaskUpdate,
     repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
+    if_match: Annotated[Optional[str], Header()] = None,
 ):
-    """Обновляет задачу"""
-    return await repo.update(task_id, task_update)
+    """Обновляет задачу. С If-Match обновление пройдет, только если задачу не меняли с этой версии, иначе 412"""
+    task = await repo.update(task_id, task_update, if_match_versions(if_match) if if_match else None)
+    return ModelResponse(task, headers={"ETag": make_etag(task.version)})
 
 
 @task_router.delete("/{task_id}", response_model=TaskResponse)
@@ -69,6 +208,6 @@ async def delete_task(
     repo: Annotated[BaseTaskRepository, Depends(get_task_repo)],
 ):
     """Удаляет задачу"""
-    return await repo.delete(task_id)
+    return ModelResponse(await repo.delete(task_id))
 
 
@@ -1,61 +1,88 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, status
+from typing import Annotated
 from typing import Optional
 from uuid import UUID
 
 from src.repositories.auth import AuthRepository, get_auth_repo
-from src.api.models.user import UserCreate, UserUpdate
+from src.api.models.user import UserCreate, UserUpdate, UserPublic
+from src.api.models.projection import parse_fields
+from src.api.models.pagination import CursorPage, TOTAL_COUNT_HEADER, TotalMode
 from src.repositories.user import get_user_repo, UserRepository
+from src.utils.responses import ModelResponse
+from src.utils.etag import make_etag, etag_matches, if_match_versions, not_modified
 
 
 user_router = APIRouter(prefix="/users", tags=["Users"])
 
 
-@user_router.post("/", status_code=status.HTTP_201_CREATED)
+@user_router.post("/", response_model=UserPublic, status_code=status.HTTP_201_CREATED)
 async def create_user(
     user: UserCreate,
     service: AuthRepository = Depends(get_auth_repo),
 ):
     """Эндпоинт для создания нового пользователя"""
     user = await service.registration(user)
-    return user
+    return ModelResponse(user, status.HTTP_201_CREATED, model=UserPublic)
 
 
-@user_router.get("/")
+@user_router.get("/", response_model=list[UserPublic] | CursorPage[UserPublic])
 async def get_users(
     skip: Optional[int] = 0,
     limit: Optional[int] = 50,
+    cursor: Optional[str] = None,
+    order_by: str = "id",
+    total: Optional[TotalMode] = None,
+    fields: Optional[str] = None,
     repo: UserRepository = Depends(get_user_repo),
 ):
-    """Эндпоинт для плучения списка всех пользователей"""
-    return await repo.get_list(skip, limit)
+    """Эндпоинт для плучения списка всех пользователей (пустой cursor включает курсорную пагинацию, fields выбирает поля)"""
+    projection = parse_fields(UserPublic, fields)
+    body = await repo.get_list_json(skip, limit, cursor, order_by, projection)
+    headers = {TOTAL_COUNT_HEADER: str(await repo.count(total))} if total else None
+    return ModelResponse(body, headers=headers)
 
 
-@user_router.get("/{user_id}")
+@user_router.get("/{user_id}", response_model=UserPublic)
 async def get_user(
     user_id: UUID,
     repo: UserRepository = Depends(get_user_repo),
+    fields: Optional[str] = None,
+    if_none_match: Annotated[Optional[str], Header()] = None,
 ):
-    """Эндпоинт для получения пользователя"""
-    return await repo.get(user_id)
+    """Эндпоинт для получения пользователя (If-None-Match с актуальным ETag дает 304 без чтения пользователя)"""
+    projection = parse_fields(UserPublic, fields) if fields else None
+    if if_none_match:
+        version = await repo.get_version(user_id)
+        if version is not None and etag_matches(if_none_match, make_etag(version, projection)):
+            return not_modified(make_etag(version, projection))
+    user = await repo.get(user_id)
+    tag = make_etag(user.version, projection)
+    if etag_matches(if_none_match, tag):
+        return not_modified(tag)
+    if projection:
+        return ModelResponse(projection.model_validate(user), headers={"ETag": tag})
+    return ModelResponse(user, headers={"ETag": tag}, model=UserPublic)
 
 
-@user_router.put("/{user_id}")
+@user_router.put("/{user_id}", response_model=UserPublic)
 async def update_user(
     user_id: UUID,
     user: UserUpdate,
     repo: UserRepository = Depends(get_user_repo),
+    if_match: Annotated[Optional[str], Header()] = None,
 ):
-    """Эндпоинт для обновления пользователя"""
-    return await repo.update(user_id, user)
+    """Эндпоинт для обновления пользователя (If-Match включает оптимистичную блокировку, при конфликте 412)"""
+    user = await repo.update(user_id, user, if_match_versions(if_match) if if_match else None)
+    return ModelResponse(user, headers={"ETag": make_etag(user.version)}, model=UserPublic)
 
 
-@user_router.delete("/{user_id}")
+@user_router.delete("/{user_id}", response_model=UserPublic)
 async def delete_user(
     user_id: UUID,
     repo: UserRepository = Depends(get_user_repo),
 ):
     """Эдпоинт для удаления пользователя"""
-    return await repo.delete(user_id)
+    return ModelResponse(await repo.delete(user_id), model=UserPublic)
 
 
     
\ No newline at end of file
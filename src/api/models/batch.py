@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Generic, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+
+class BatchItem(BaseModel, Generic[T]):
+    index: int
+    status: int
+    item: Optional[T] = None
+    detail: Optional[str] = None
+
+
+class ImportRowError(BaseModel):
+    row: int
+    status: int
+    detail: str
+
+
+class ImportResult(BaseModel):
+    imported: int
+    failed: int
+    errors: list[ImportRowError]
+    seconds: float
+    rows_per_second: float
@@ -0,0 +1,15 @@
+from pydantic import BaseModel
+from typing import Generic, Literal, Optional, TypeVar
+
+
+T = TypeVar("T")
+
+TOTAL_COUNT_HEADER = "X-Total-Count"
+
+# exact: COUNT(*) с теми же фильтрами, estimated: оценка планировщика без чтения строк
+TotalMode = Literal["exact", "estimated"]
+
+
+class CursorPage(BaseModel, Generic[T]):
+    items: list[T]
+    next_cursor: Optional[str] = None
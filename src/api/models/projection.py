@@ -0,0 +1,28 @@
+from pydantic import BaseModel, ConfigDict, create_model
+from functools import lru_cache
+
+from src.exc.api import UnknownFieldsException
+
+
+@lru_cache(maxsize=256)
+def projection(model: type[BaseModel], fields: frozenset[str]) -> type[BaseModel]:
+    """Модель ответа только с полями fields в порядке исходной модели. Строится один раз на набор полей."""
+    return create_model(
+        f"{model.__name__}[{','.join(name for name in model.model_fields if name in fields)}]",
+        __config__=ConfigDict(from_attributes=True),
+        **{name: (info.annotation, info) for name, info in model.model_fields.items() if name in fields},
+    )
+
+
+def parse_fields(model: type[BaseModel], fields: str | None, default: type[BaseModel] | None = None) -> type[BaseModel]:
+    """
+    Разбирает ?fields=name,status в модель ответа. id возвращается всегда,
+    без fields используется default, а если его нет, сама model.
+    """
+    if not fields:
+        return default or model
+    names = {name.strip() for name in fields.split(",") if name.strip()}
+    unknown = sorted(names - model.model_fields.keys())
+    if unknown:
+        raise UnknownFieldsException(unknown)
+    return projection(model, frozenset(names | {"id"}))
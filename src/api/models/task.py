@@ -19,7 +19,25 @@ class TaskUpdate(BaseModel):
     status: Optional[TaskStatusEnum] = Field(default=None)
     owner_id: Optional[UUID] = Field(default=None)
 
+class TaskBatchUpdate(TaskUpdate):
+    id: UUID
+
 class TaskResponse(TaskBase):
     id: UUID
+    # 0 только у записей кэша, сделанных до появления версий
+    version: int = 0
+
+    model_config = ConfigDict(from_attributes=True)
+
+class TaskSummary(BaseModel):
+    """Задача в списках по умолчанию: без описания."""
+    id: UUID
+    name: str
+    status: TaskStatusEnum
+    owner_id: UUID
+
+    model_config = ConfigDict(from_attributes=True)
 
-    model_config = ConfigDict(from_attributes=True)
\ No newline at end of file
+class TaskStats(BaseModel):
+    total: int
+    by_status: dict[TaskStatusEnum, int]
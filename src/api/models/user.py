@@ -54,12 +54,17 @@ class UserUpdate(BaseUserModel):
             )
 
 
-class UserResponse(BaseUserModel):
+class UserPublic(BaseUserModel):
     id: UUID
-    hashed_password: str
     is_active: bool
     is_verified: bool
     role: UserRoleEnum
+    # 0 только у записей кэша, сделанных до появления версий
+    version: int = 0
 
     model_config = ConfigDict(from_attributes=True)
 
+
+class UserResponse(UserPublic):
+    hashed_password: str
+
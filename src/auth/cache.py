@@ -0,0 +1,46 @@
+from pydantic import BaseModel
+from uuid import UUID
+import hashlib
+import time
+
+from src.cache import LRUCache, object_cache
+from src.settings import settings
+
+
+class TokenCache:
+    """
+    Кэш уже проверенных токенов: claims и пользователь по sha256 от токена.
+    Запись живет до exp токена или TOKEN_CACHE_TTL, смотря что наступит раньше.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.entries = LRUCache(maxsize, ttl)
+
+    @staticmethod
+    def key(token: str | bytes) -> str:
+        if isinstance(token, str):
+            token = token.encode()
+        return hashlib.sha256(token).hexdigest()
+
+    def get(self, token: str | bytes) -> tuple[dict, BaseModel] | None:
+        return self.entries.get(self.key(token))
+
+    def set(self, token: str | bytes, payload: dict, user: BaseModel):
+        ttl = payload.get("exp", 0) - time.time()
+        self.entries.set(self.key(token), (payload, user), ttl)
+
+    def invalidate_user(self, user_id: UUID | str | None):
+        if user_id is None:
+            self.entries.clear()
+            return
+        user_id = str(user_id)
+        for key, (_, user) in self.entries.items():
+            if str(user.id) == user_id:
+                self.entries.pop(key)
+
+    def stats(self) -> dict:
+        return self.entries.stats()
+
+
+token_cache = TokenCache(settings.TOKEN_CACHE_SIZE, settings.TOKEN_CACHE_TTL)
+object_cache.on_change("User", token_cache.invalidate_user)
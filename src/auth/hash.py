@@ -1,5 +1,68 @@
-import bcrypt
+from concurrent.futures import ThreadPoolExecutor
 from abc import abstractmethod, ABC
+import threading
+import asyncio
+import bcrypt
+
+from src.exc.api import ServiceUnavailableException
+from src.settings import settings
+
+
+class HashingPool:
+    """
+    Отдельный пул потоков для хеширования паролей.
+    Если все потоки заняты и очередь заполнена, запрос сразу получает 503,
+    а не ждет в хвосте и не копит задержку.
+    """
+
+    def __init__(self, workers: int, queue_size: int):
+        self.workers = workers
+        self.capacity = workers + queue_size
+        self.executor: ThreadPoolExecutor | None = None
+        self.pending = 0
+        self.rejected = 0
+        # завершение задачи приходит из потока пула
+        self._lock = threading.Lock()
+
+    async def run(self, func, *args):
+        """
+        pending считает отправленную в пул работу, а не ждущие корутины: если клиент отключился,
+        bcrypt все равно досчитает, поэтому слот освобождается только когда задача в пуле завершена или снята.
+        """
+        with self._lock:
+            if self.pending >= self.capacity:
+                self.rejected += 1
+                raise ServiceUnavailableException("Too many authentication attempts, try later")
+            self.pending += 1
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="hasher")
+        try:
+            future = self.executor.submit(func, *args)
+        except RuntimeError:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self.pending -= 1
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "pending": self.pending,
+            "rejected": self.rejected,
+        }
+
+
+hashing_pool = HashingPool(settings.HASH_WORKERS, settings.HASH_QUEUE_SIZE)
 
 
 class Hasher(ABC):
@@ -9,8 +72,14 @@ class Hasher(ABC):
     @abstractmethod
     def verify(self, password: str, hashed: str) -> bool: ...
 
+    async def hash_async(self, password: str) -> str:
+        return await hashing_pool.run(self.hash, password)
+
+    async def verify_async(self, password: str, hashed: str) -> bool:
+        return await hashing_pool.run(self.verify, password, hashed)
+
 
-class BcryptHasher:
+class BcryptHasher(Hasher):
 
     def hash(self, password: str) -> str:
         salt = bcrypt.gensalt()
@@ -0,0 +1,124 @@
+from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey, RSAPublicKey
+from cryptography.hazmat.primitives.serialization import load_pem_private_key, load_pem_public_key
+from jwt.algorithms import RSAAlgorithm
+from jwt.exceptions import InvalidTokenError
+from pathlib import Path
+import hashlib
+import base64
+import signal
+import asyncio
+import json
+import time
+
+from src.settings import settings, logger
+from src.settings.environment import AuthJWT
+
+
+def key_id(public_key: RSAPublicKey) -> str:
+    """kid ключа — отпечаток JWK по RFC 7638."""
+    jwk = RSAAlgorithm.to_jwk(public_key, as_dict=True)
+    canonical = json.dumps({"e": jwk["e"], "kty": jwk["kty"], "n": jwk["n"]}, separators=(",", ":"), sort_keys=True)
+    digest = hashlib.sha256(canonical.encode()).digest()
+    return base64.urlsafe_b64encode(digest).decode().rstrip("=")
+
+
+class KeyRing:
+    """
+    Разобранные один раз RSA ключи для подписи и проверки JWT.
+
+    Подписывает текущий приватный ключ, проверка принимает текущий публичный ключ
+    и все ключи из каталога rotated_keys_dir, чтобы старые токены жили до конца ротации.
+    Ключи перечитываются по SIGHUP или когда меняется mtime файлов.
+    """
+
+    def __init__(self, config: AuthJWT):
+        self.config = config
+        self.signing_kid: str | None = None
+        self.signing_key: RSAPrivateKey | None = None
+        self.public_keys: dict[str, RSAPublicKey] = {}
+        self._snapshot: tuple | None = None
+        self._checked_at = 0.0
+
+    def _public_key_paths(self) -> list[Path]:
+        paths = [self.config.public_key]
+        if self.config.rotated_keys_dir.is_dir():
+            paths.extend(sorted(self.config.rotated_keys_dir.glob("*.pem")))
+        return paths
+
+    def _take_snapshot(self) -> tuple:
+        paths = [self.config.private_key, *self._public_key_paths()]
+        if self.config.rotated_keys_dir.is_dir():
+            paths.append(self.config.rotated_keys_dir)
+        return tuple((path, path.stat().st_mtime_ns) for path in paths)
+
+    def load(self):
+        snapshot = self._take_snapshot()
+        private_key = load_pem_private_key(self.config.private_key.read_bytes(), password=None)
+        public_keys = {}
+        for path in self._public_key_paths():
+            public_key = load_pem_public_key(path.read_bytes())
+            public_keys[key_id(public_key)] = public_key
+        signing_kid = key_id(private_key.public_key())
+        public_keys.setdefault(signing_kid, private_key.public_key())
+
+        self.signing_key, self.signing_kid, self.public_keys = private_key, signing_kid, public_keys
+        self._snapshot = snapshot
+        self._checked_at = time.monotonic()
+        logger.info(f"Loaded JWT keys, signing kid {signing_kid}, {len(public_keys)} verification keys")
+
+    def reload(self):
+        try:
+            self.load()
+        except (OSError, ValueError) as e:
+            if self.signing_key is None:
+                raise
+            logger.error(f"Error with reload JWT keys, keep previous keys: {e}")
+
+    def refresh(self):
+        if self.signing_key is None:
+            self.load()
+            return
+        now = time.monotonic()
+        if now - self._checked_at < self.config.key_reload_interval:
+            return
+        self._checked_at = now
+        try:
+            changed = self._take_snapshot() != self._snapshot
+        except OSError as e:
+            logger.error(f"Error with check JWT keys: {e}")
+            return
+        if changed:
+            self.reload()
+
+    def signing(self) -> tuple[str, RSAPrivateKey]:
+        self.refresh()
+        return self.signing_kid, self.signing_key
+
+    def verification_key(self, kid: str | None) -> RSAPublicKey:
+        self.refresh()
+        if kid is None:
+            kid = self.signing_kid
+        try:
+            return self.public_keys[kid]
+        except KeyError:
+            raise InvalidTokenError(f"Unknown key id {kid}")
+
+    def jwks(self) -> dict:
+        self.refresh()
+        keys = []
+        for kid, public_key in self.public_keys.items():
+            jwk = RSAAlgorithm.to_jwk(public_key, as_dict=True)
+            jwk.update(kid=kid, use="sig", alg=self.config.algorithm)
+            keys.append(jwk)
+        return {"keys": keys}
+
+
+key_ring = KeyRing(settings.auth)
+
+
+def install_reload_signal():
+    """Перечитывать ключи по SIGHUP (только в главном потоке на Unix)."""
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGHUP, key_ring.reload)
+    except (AttributeError, NotImplementedError, RuntimeError, ValueError):
+        logger.info("SIGHUP key reload is not available in this process")
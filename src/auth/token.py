@@ -5,6 +5,7 @@ import jwt
 
 from src.settings import settings
 from src.utils.enums import TokenName
+from src.auth.keys import key_ring
 
 
 
@@ -14,7 +15,10 @@ def encode_jwt(
     algorithm: str = settings.auth.algorithm,
     expire_minutes: int = settings.auth.access_token_expire_minutes,
 ) -> str:
-    private_key = private_key or settings.auth.load_private()
+    headers = None
+    if private_key is None:
+        kid, private_key = key_ring.signing()
+        headers = {"kid": kid}
     to_encode = payload.copy()
     now = datetime.now(timezone.utc)
     expire = now + timedelta(minutes=expire_minutes)
@@ -27,6 +31,7 @@ def encode_jwt(
         payload=to_encode,
         key=private_key,
         algorithm=algorithm,
+        headers=headers,
     )
 
 
@@ -35,7 +40,9 @@ def decode_jwt(
         public_key: str | None = None,
         algorithm: str = settings.auth.algorithm,
 ) -> dict:
-    public_key = public_key or settings.auth.load_public()
+    if public_key is None:
+        kid = jwt.get_unverified_header(token).get("kid")
+        public_key = key_ring.verification_key(kid)
     return jwt.decode(
         token,
         public_key,
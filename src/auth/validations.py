@@ -23,9 +23,9 @@ async def get_user_from_verification_token(
 ) -> User:
     return await user_service.get_current_user_from_verify(token)
     
-def get_user_with_permissions(permission: UserRoleEnum, user: User = Depends(get_current_user)):
-    def check_permission():
-        if user.role != permission or user.role != UserRoleEnum.ADMIN:
+def get_user_with_permissions(permission: UserRoleEnum):
+    def check_permission(user: User = Depends(get_current_user)):
+        if user.role not in (permission, UserRoleEnum.ADMIN):
             raise HTTPException(status.HTTP_403_FORBIDDEN, detail="Don't have rights for this action")
         return user
     return check_permission
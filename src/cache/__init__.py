@@ -0,0 +1,4 @@
+from .lru import LRUCache
+from .entry import CacheEntry
+from .singleflight import SingleFlight, single_flight
+from .tiered import TieredCache, object_cache
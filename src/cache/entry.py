@@ -0,0 +1,37 @@
+from typing import NamedTuple
+import random
+import math
+import time
+
+
+class CacheEntry(NamedTuple):
+    """Значение в Redis: поколение модели, время истечения, время пересборки и json."""
+
+    generation: str
+    expires_at: float
+    delta: float
+    value: str
+
+    def pack(self) -> str:
+        return f"{self.generation}:{self.expires_at:.3f}:{self.delta:.4f}:{self.value}"
+
+    @classmethod
+    def unpack(cls, raw: str | None, generation: str) -> "CacheEntry | None":
+        if not raw:
+            return None
+        parts = raw.split(":", 3)
+        if len(parts) != 4 or parts[0] != generation:
+            return None
+        try:
+            return cls(parts[0], float(parts[1]), float(parts[2]), parts[3])
+        except ValueError:
+            return None
+
+    def should_refresh(self, beta: float) -> bool:
+        """
+        Вероятностное раннее обновление (XFetch): чем ближе истечение и чем дороже
+        пересборка, тем выше шанс, что этот запрос обновит ключ заранее.
+        """
+        if beta <= 0 or self.delta <= 0:
+            return False
+        return time.time() - self.delta * beta * math.log(1 - random.random()) >= self.expires_at
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from typing import Any, Hashable
+import time
+
+
+class LRUCache:
+    """
+    Ограниченный по размеру LRU кэш в памяти процесса с TTL на каждую запись.
+    Если задан max_bytes, вытесняет записи и по суммарному размеру, который передает вызывающий.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_bytes: int | None = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._data: OrderedDict[Hashable, tuple[float, Any, int]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            self.misses += 1
+            return default
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self.pop(key)
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None, size: int = 0):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or (self.max_bytes is not None and size > self.max_bytes):
+            return
+        self.pop(key)
+        self._data[key] = (time.monotonic() + ttl, value, size)
+        self.bytes += size
+        while len(self._data) > self.maxsize or (self.max_bytes is not None and self.bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self.bytes -= entry[2]
+        return entry[1]
+
+    def keys(self) -> list[Hashable]:
+        return list(self._data)
+
+    def items(self):
+        return [(key, value) for key, (_, value, _) in self._data.items()]
+
+    def clear(self):
+        self._data.clear()
+        self.bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
@@ -0,0 +1,42 @@
+from typing import Awaitable, Callable, Hashable, Any
+import asyncio
+
+
+class SingleFlight:
+    """Конкурентные вызовы с одним ключом внутри воркера ждут одну и ту же загрузку."""
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Any:
+        while (future := self._calls.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # отменили того, кто грузил, а не нас: пробуем загрузить сами
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._calls[key] = future
+        try:
+            result = await func()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
+            if not future.done():
+                future.cancel()
+
+    def stats(self) -> dict:
+        return {"in_flight": len(self._calls), "coalesced": self.coalesced}
+
+
+single_flight = SingleFlight()
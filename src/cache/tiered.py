@@ -0,0 +1,129 @@
+from redis.asyncio.client import Redis
+from redis.exceptions import RedisError
+from collections import defaultdict
+from pydantic import BaseModel
+from typing import Callable
+from uuid import uuid4
+import asyncio
+import json
+
+from src.cache.lru import LRUCache
+from src.settings import settings, logger
+
+
+INVALIDATION_CHANNEL = "cache:invalidate"
+
+
+class TieredCache:
+    """
+    Двухуровневый кэш объектов: L1 — LRU в памяти воркера с уже провалидированными
+    pydantic моделями, L2 — Redis. Об изменениях воркеры оповещают друг друга через
+    pub/sub, чтобы каждый выкинул свою копию из L1.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, max_bytes: int):
+        self.local = LRUCache(maxsize, ttl, max_bytes)
+        self.remote_hits = 0
+        self.remote_misses = 0
+        self.worker_id = uuid4().hex
+        self._listeners: dict[str, list[Callable]] = defaultdict(list)
+        self._task: asyncio.Task | None = None
+
+    def get_local(self, model_name: str, id) -> BaseModel | None:
+        return self.local.get((model_name, str(id)))
+
+    def set_local(self, model_name: str, id, model: BaseModel, size: int):
+        self.local.set((model_name, str(id)), model, size=size)
+
+    def on_change(self, model_name: str, callback: Callable):
+        """callback(id) вызывается при изменении объекта, id=None — сброс всей модели."""
+        self._listeners[model_name].append(callback)
+
+    async def changed(self, redis: Redis, model_name: str, id=None):
+        await self.changed_many(redis, model_name, None if id is None else [id])
+
+    async def changed_many(self, redis: Redis, model_name: str, ids: list | None):
+        """Объекты (или вся модель при ids=None) изменились: чистим L1 здесь и оповещаем остальные воркеры."""
+        ids = None if ids is None else [str(id) for id in ids]
+        self._evict(model_name, ids)
+        message = json.dumps({"worker": self.worker_id, "model": model_name, "ids": ids})
+        try:
+            await redis.publish(INVALIDATION_CHANNEL, message)
+        except RedisError as e:
+            logger.error(f"Error with publish cache invalidation: {e}")
+
+    def _evict(self, model_name: str, ids: list[str] | None):
+        if ids is None:
+            for key in self.local.keys():
+                if key[0] == model_name:
+                    self.local.pop(key)
+            for callback in self._listeners[model_name]:
+                callback(None)
+            return
+        for id in ids:
+            self.local.pop((model_name, id))
+            for callback in self._listeners[model_name]:
+                callback(id)
+
+    def _evict_everything(self):
+        """Сброс L1 и всех подписчиков on_change, как будто изменились все модели."""
+        self.local.clear()
+        for model_name in list(self._listeners):
+            self._evict(model_name, None)
+
+    def _on_reconnect(self, connection):
+        self._evict_everything()
+
+    def _handle(self, data: str):
+        message = json.loads(data)
+        if message["worker"] != self.worker_id:
+            self._evict(message["model"], message["ids"])
+
+    async def _listen(self, redis: Redis):
+        while True:
+            try:
+                async with redis.pubsub(ignore_subscribe_messages=True) as pubsub:
+                    await pubsub.subscribe(INVALIDATION_CHANNEL)
+                    # пока подписки не было, оповещения могли потеряться; так же и за обрыв,
+                    # после которого redis-py сам переподключает pubsub и заново подписывается
+                    self._evict_everything()
+                    connection = pubsub.connection
+                    connection.register_connect_callback(self._on_reconnect)
+                    try:
+                        # listen() упирается в socket_timeout общего пула и на тихом канале падает с TimeoutError;
+                        # get_message с собственным таймаутом просто возвращает None
+                        while True:
+                            message = await pubsub.get_message(
+                                ignore_subscribe_messages=True, timeout=settings.REDIS_SOCKET_TIMEOUT
+                            )
+                            if message is not None:
+                                self._handle(message["data"])
+                    finally:
+                        # соединение вернется в общий пул
+                        connection.deregister_connect_callback(self._on_reconnect)
+            except (RedisError, OSError, ValueError) as e:
+                logger.error(f"Error with cache invalidation channel: {e}")
+                await asyncio.sleep(1)
+
+    def start(self, redis: Redis):
+        if self._task is None:
+            self._task = asyncio.create_task(self._listen(redis))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.local.clear()
+
+    def stats(self) -> dict:
+        return {
+            "l1": self.local.stats(),
+            "l2": {"hits": self.remote_hits, "misses": self.remote_misses},
+        }
+
+
+object_cache = TieredCache(settings.LOCAL_CACHE_SIZE, settings.LOCAL_CACHE_TTL, settings.LOCAL_CACHE_MAX_BYTES)
@@ -1,2 +1,2 @@
 from .models import Task, User
-from .core import get_async_session, Base
\ No newline at end of file
+from .core import get_async_session, get_read_session, get_session_maker, get_read_session_maker, Base
\ No newline at end of file
@@ -5,22 +5,96 @@ from sqlalchemy.ext.asyncio import (
 )
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.exc import SQLAlchemyError
-from typing import AsyncGenerator
+from fastapi import Depends, Request
+from typing import Annotated, AsyncGenerator, Callable
 
+from src.db.replicas import replicas, reads_from_primary
+from src.db.pool import engine_options
 from src.settings import settings, logger
 
 
-engine = create_async_engine(settings.ASYNC_DATABASE_URL)
+engine = create_async_engine(settings.ASYNC_DATABASE_URL, **engine_options())
 async_session_maker = async_sessionmaker(engine)
 
 class Base(DeclarativeBase):
     ...
 
 
+class LazySession:
+    """
+    Заместитель AsyncSession, который создает сессию при первом обращении к ней.
+    Запрос, на который целиком ответил кэш, не создает сессию и не берет соединение из пула.
+    """
+
+    def __init__(self, factory: Callable[[], AsyncSession]):
+        self._factory = factory
+        self._session: AsyncSession | None = None
+
+    def _open(self) -> AsyncSession:
+        if self._session is None:
+            self._session = self._factory()
+        return self._session
+
+    def __getattr__(self, name):
+        return getattr(self._open(), name)
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+
+
 async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    session = LazySession(async_session_maker)
     try:
-        async with async_session_maker() as session:
-            yield session
+        yield session
     except SQLAlchemyError as e:
         logger.error(f"Error with connect to db: {e}")
-        raise
\ No newline at end of file
+        raise
+    finally:
+        await session.close()
+
+
+def get_session_maker() -> async_sessionmaker[AsyncSession]:
+    """Фабрика сессий для ответов, которые читают базу уже после выхода из эндпоинта (стриминг)."""
+    return async_session_maker
+
+
+async def get_read_session(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_async_session)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Сессия для чтения: здоровая реплика, либо сессия мастера, если реплик нет или клиент только что писал.
+    Реплика выбирается при первом запросе к базе, а не при создании зависимости.
+    """
+    if not replicas.enabled or reads_from_primary(request):
+        yield session
+        return
+
+    primary = session._open if isinstance(session, LazySession) else lambda: session
+    replica_sessions = []
+
+    def open_read_session() -> AsyncSession:
+        maker = replicas.session_maker()
+        if maker is None:
+            return primary()
+        replica_sessions.append(maker())
+        return replica_sessions[-1]
+
+    try:
+        yield LazySession(open_read_session)
+    except SQLAlchemyError as e:
+        logger.error(f"Error with connect to replica: {e}")
+        raise
+    finally:
+        for replica_session in replica_sessions:
+            await replica_session.close()
+
+
+def get_read_session_maker(
+    request: Request,
+    session_maker: Annotated[async_sessionmaker[AsyncSession], Depends(get_session_maker)],
+) -> async_sessionmaker[AsyncSession]:
+    if reads_from_primary(request):
+        return session_maker
+    return replicas.session_maker() or session_maker
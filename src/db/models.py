@@ -1,16 +1,23 @@
-from sqlalchemy import String, Enum, Date, Boolean, ForeignKey
+from sqlalchemy import String, Enum, Date, Boolean, Integer, ForeignKey, Index, Computed, DDL, event
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from uuid import UUID, uuid4
+from uuid import UUID
 from datetime import date
 
 from src.db.core import Base
+from src.db.partitioning import hash_partitions
+from src.settings import settings
 from src.utils.enums import TaskStatusEnum, UserRoleEnum
+from src.utils.ids import uuid7
+
+
+SEARCH_CONFIG = "russian"
 
 
 class Task(Base):
     __tablename__ = "tasks"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, index=True, default=uuid4)
+    id: Mapped[UUID] = mapped_column(primary_key=True, default=uuid7)
     name: Mapped[str] = mapped_column(String(150), nullable=False)
     description: Mapped[str] = mapped_column(String(555), nullable=True)
     status: Mapped[str] = mapped_column(
@@ -18,15 +25,43 @@ class Task(Base):
         default=TaskStatusEnum.CREATED,
         nullable=False
     )
-    owner_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), nullable=False)
+    # ключ партиционирования обязан входить в первичный ключ, поэтому в базе он (id, owner_id)
+    owner_id: Mapped[UUID] = mapped_column(ForeignKey("users.id"), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer(), default=1, server_default="1", nullable=False)
+    # поддерживается самой базой, в ORM не загружается
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+        deferred=True,
+    )
 
     owner = relationship("User", back_populates="tasks")
 
+    __table_args__ = (
+        Index("ix_tasks_owner_id_status_id", "owner_id", "status", "id"),
+        Index("ix_tasks_status_id", "status", "id"),
+        Index("ix_tasks_name_id", "name", "id"),
+        Index("ix_tasks_search_vector", "search_vector", postgresql_using="gin"),
+        {"postgresql_partition_by": "HASH (owner_id)"},
+    )
+    # для ORM задача по-прежнему определяется одним id
+    __mapper_args__ = {"primary_key": ["id"]}
+
+
+for statement in hash_partitions(Task.__tablename__, settings.TASK_PARTITIONS):
+    event.listen(Task.__table__, "after_create", DDL(statement))
+
+
 class User(Base):
     __tablename__ = "users"
 
-    id: Mapped[UUID] = mapped_column(primary_key=True, index=True, default=uuid4)
-    name: Mapped[str] = mapped_column(String(100), nullable=False)
+    id: Mapped[UUID] = mapped_column(primary_key=True, index=True, default=uuid7)
+    name: Mapped[str] = mapped_column(String(100), unique=True, index=True, nullable=False)
     surname: Mapped[str] = mapped_column(String(100))
     email: Mapped[str] = mapped_column(String(255), unique=True, index=True, nullable=False)
     hashed_password: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -34,6 +69,7 @@ class User(Base):
     is_active: Mapped[bool] = mapped_column(Boolean(), default=True)
     is_verified: Mapped[bool] = mapped_column(Boolean(), default=False)
     role: Mapped[Enum] = mapped_column(Enum(UserRoleEnum), default=UserRoleEnum.USER, nullable=False)
+    version: Mapped[int] = mapped_column(Integer(), default=1, server_default="1", nullable=False)
 
     tasks = relationship("Task", back_populates="owner")
 
@@ -0,0 +1,214 @@
+"""
+Hash-партиционирование tasks по owner_id и перенос данных в партиционированную таблицу без остановки приложения.
+
+Переход на рабочей базе:
+1. рядом создается tasks_partitioned с TASK_PARTITIONS партициями, триггер на tasks повторяет в ней каждую запись;
+2. строки копируются пачками по id, каждая пачка блокирует свои строки FOR SHARE только до конца своей транзакции;
+3. под коротким ACCESS EXCLUSIVE таблицы меняются именами, старая остается как tasks_unpartitioned.
+Приложение все это время пишет и читает tasks как обычно. После переключения миграция 007 ничего не делает.
+
+    python -m src.db.partitioning --batch 5000
+    python -m src.db.partitioning --drop-old
+"""
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+from uuid import UUID
+import argparse
+import asyncio
+import time
+
+from src.db.core import engine
+from src.settings import settings
+
+
+TABLE = "tasks"
+SHADOW = f"{TABLE}_partitioned"
+OLD = f"{TABLE}_unpartitioned"
+PARTITION_KEY = "owner_id"
+
+# Индексы модели Task: в новой таблице они создаются с суффиксом _new и получают свои имена при переключении
+INDEXES = {
+    "ix_tasks_owner_id_status_id": "(owner_id, status, id)",
+    "ix_tasks_status_id": "(status, id)",
+    "ix_tasks_name_id": "(name, id)",
+    "ix_tasks_search_vector": "USING gin (search_vector)",
+}
+# Есть только у старой таблицы: поиск по id обслуживает первичный ключ (id, owner_id)
+OLD_INDEXES = ("ix_tasks_id",)
+
+IS_PARTITIONED = text(f"SELECT relkind = 'p' FROM pg_class WHERE oid = CAST('{TABLE}' AS regclass)")
+SHADOW_EXISTS = text(f"SELECT to_regclass('{SHADOW}') IS NOT NULL")
+# генерируемые колонки база считает сама, их нельзя ни вставлять, ни копировать
+COLUMNS = text(
+    "SELECT column_name FROM information_schema.columns "
+    f"WHERE table_schema = current_schema() AND table_name = '{TABLE}' AND is_generated = 'NEVER' "
+    "ORDER BY ordinal_position"
+)
+
+
+def hash_partitions(table: str, count: int, parent: str | None = None) -> list[str]:
+    """CREATE TABLE для партиций {table}_p0..{table}_p{count-1}; parent задает таблицу, к которой они крепятся."""
+    return [
+        f"CREATE TABLE {table}_p{remainder} PARTITION OF {parent or table} "
+        f"FOR VALUES WITH (MODULUS {count}, REMAINDER {remainder})"
+        for remainder in range(count)
+    ]
+
+
+def shadow_statements(count: int) -> list[str]:
+    """Пустая партиционированная копия tasks. Ключ партиционирования обязан входить в первичный ключ."""
+    return [
+        f"CREATE TABLE {SHADOW} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING GENERATED) PARTITION BY HASH ({PARTITION_KEY})",
+        *hash_partitions(TABLE, count, SHADOW),
+        f"ALTER TABLE {SHADOW} ADD CONSTRAINT {SHADOW}_pkey PRIMARY KEY (id, {PARTITION_KEY})",
+        f"ALTER TABLE {SHADOW} ADD CONSTRAINT {SHADOW}_owner_id_fkey FOREIGN KEY (owner_id) REFERENCES users (id)",
+        *(f"CREATE INDEX {name}_new ON {SHADOW} {columns}" for name, columns in INDEXES.items()),
+    ]
+
+
+def mirror_statements(columns: list[str]) -> list[str]:
+    """
+    Триггер, который повторяет в новой таблице каждую запись в tasks. Обновление это удаление и вставка:
+    при смене owner_id строка переезжает в другую партицию, а еще не скопированная строка просто появляется.
+    """
+    names = ", ".join(columns)
+    new_values = ", ".join(f"NEW.{column}" for column in columns)
+    return [
+        f"""
+        CREATE FUNCTION {SHADOW}_mirror() RETURNS trigger LANGUAGE plpgsql AS $$
+        BEGIN
+            IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                DELETE FROM {SHADOW} WHERE id = OLD.id AND {PARTITION_KEY} = OLD.{PARTITION_KEY};
+            END IF;
+            IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                INSERT INTO {SHADOW} ({names}) VALUES ({new_values}) ON CONFLICT DO NOTHING;
+            END IF;
+            RETURN NULL;
+        END
+        $$
+        """,
+        f"CREATE TRIGGER {SHADOW}_mirror AFTER INSERT OR UPDATE OR DELETE ON {TABLE} "
+        f"FOR EACH ROW EXECUTE FUNCTION {SHADOW}_mirror()",
+    ]
+
+
+def copy_all_statement(columns: list[str]) -> str:
+    names = ", ".join(columns)
+    return f"INSERT INTO {SHADOW} ({names}) SELECT {names} FROM {TABLE}"
+
+
+def copy_batch_statement(columns: list[str]) -> str:
+    """
+    Следующая пачка по id. FOR SHARE не дает параллельному UPDATE или DELETE проскочить между чтением пачки
+    и ее вставкой: триггер такой записи сработает уже после коммита пачки и увидит скопированную строку.
+    """
+    names = ", ".join(columns)
+    return f"""
+        WITH batch AS (
+            SELECT {names} FROM {TABLE} WHERE id > :after ORDER BY id LIMIT :size FOR SHARE
+        ), copied AS (
+            INSERT INTO {SHADOW} ({names}) SELECT {names} FROM batch ON CONFLICT DO NOTHING
+        )
+        SELECT count(*), (SELECT id FROM batch ORDER BY id DESC LIMIT 1) FROM batch
+    """
+
+
+def swap_statements() -> list[str]:
+    """Старая таблица со своими индексами уходит под именем tasks_unpartitioned, новая получает имена из модели."""
+    return [
+        f"ALTER TABLE {TABLE} RENAME TO {OLD}",
+        f"ALTER TABLE {OLD} RENAME CONSTRAINT {TABLE}_pkey TO {OLD}_pkey",
+        f"ALTER TABLE {OLD} RENAME CONSTRAINT {TABLE}_owner_id_fkey TO {OLD}_owner_id_fkey",
+        *(f"ALTER INDEX IF EXISTS {name} RENAME TO {name}_unpartitioned" for name in (*INDEXES, *OLD_INDEXES)),
+        f"ALTER TABLE {SHADOW} RENAME TO {TABLE}",
+        f"ALTER TABLE {TABLE} RENAME CONSTRAINT {SHADOW}_pkey TO {TABLE}_pkey",
+        f"ALTER TABLE {TABLE} RENAME CONSTRAINT {SHADOW}_owner_id_fkey TO {TABLE}_owner_id_fkey",
+        *(f"ALTER INDEX {name}_new RENAME TO {name}" for name in INDEXES),
+    ]
+
+
+async def _columns(conn: AsyncConnection) -> list[str]:
+    columns = list(await conn.scalars(COLUMNS))
+    await conn.commit()
+    return columns
+
+
+async def prepare(conn: AsyncConnection, count: int):
+    """Создает новую таблицу и триггер в одной транзакции: все, что записано после нее, попадет в обе таблицы."""
+    statements = shadow_statements(count) + mirror_statements(await _columns(conn))
+    async with conn.begin():
+        for statement in statements:
+            await conn.execute(text(statement))
+
+
+async def backfill(conn: AsyncConnection, size: int, after: UUID, pause: float):
+    """Копирует строки пачками по size, каждая пачка в своей транзакции. after позволяет продолжить с напечатанного id."""
+    statement = text(copy_batch_statement(await _columns(conn)))
+    copied, started = 0, time.monotonic()
+    while True:
+        async with conn.begin():
+            count, last = (await conn.execute(statement, {"after": after, "size": size})).one()
+        if not count:
+            break
+        copied += count
+        after = last
+        print(f"copied {copied} rows, {copied / (time.monotonic() - started):.0f} rows/s, last id {after}")
+        if pause:
+            await asyncio.sleep(pause)
+
+
+async def cutover(conn: AsyncConnection, lock_timeout: str, attempts: int):
+    """
+    Переключение под ACCESS EXCLUSIVE. lock_timeout не дает очереди запросов выстроиться за долгой транзакцией:
+    если блокировку не дали быстро, попытка повторяется.
+    """
+    for attempt in range(1, attempts + 1):
+        try:
+            async with conn.begin():
+                await conn.execute(text(f"SET LOCAL lock_timeout = '{lock_timeout}'"))
+                await conn.execute(text(f"LOCK TABLE {TABLE}, {SHADOW} IN ACCESS EXCLUSIVE MODE"))
+                await conn.execute(text(f"DROP TRIGGER {SHADOW}_mirror ON {TABLE}"))
+                await conn.execute(text(f"DROP FUNCTION {SHADOW}_mirror()"))
+                for statement in swap_statements():
+                    await conn.execute(text(statement))
+            break
+        except Exception as e:
+            if attempt == attempts:
+                raise
+            print(f"cutover attempt {attempt} failed: {e}")
+            await asyncio.sleep(1)
+    await conn.execute(text(f"ANALYZE {TABLE}"))
+    await conn.commit()
+
+
+async def main(args):
+    async with engine.connect() as conn:
+        if args.drop_old:
+            await conn.execute(text(f"DROP TABLE IF EXISTS {OLD}"))
+            await conn.commit()
+            print(f"dropped {OLD}")
+        elif await conn.scalar(IS_PARTITIONED):
+            print(f"{TABLE} is already partitioned")
+        else:
+            shadow_exists = await conn.scalar(SHADOW_EXISTS)
+            await conn.commit()
+            if not shadow_exists:
+                await prepare(conn, settings.TASK_PARTITIONS)
+                print(f"created {SHADOW} with {settings.TASK_PARTITIONS} partitions and the mirror trigger")
+            await backfill(conn, args.batch, args.after, args.pause)
+            if not args.no_cutover:
+                await cutover(conn, args.lock_timeout, args.attempts)
+                print(f"{TABLE} is partitioned, the old table is kept as {OLD}")
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--batch", type=int, default=5000)
+    parser.add_argument("--after", type=UUID, default=UUID(int=0))
+    parser.add_argument("--pause", type=float, default=0.0)
+    parser.add_argument("--no-cutover", action="store_true")
+    parser.add_argument("--lock-timeout", default="2s")
+    parser.add_argument("--attempts", type=int, default=10)
+    parser.add_argument("--drop-old", action="store_true")
+    asyncio.run(main(parser.parse_args()))
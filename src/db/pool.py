@@ -0,0 +1,77 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy import exc
+import asyncio
+import bisect
+import time
+
+from src.settings import settings, logger
+
+
+class MonitoredQueuePool(AsyncAdaptedQueuePool):
+    """Пул соединений SQLAlchemy, который пишет гистограмму ожидания соединения, таймауты и пик overflow."""
+
+    WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_counts = [0] * (len(self.WAIT_BUCKETS) + 1)
+        self.wait_total = 0.0
+        self.timeouts = 0
+        self.overflow_peak = 0
+
+    def connect(self):
+        started = time.monotonic()
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = time.monotonic() - started
+            self.wait_counts[bisect.bisect_left(self.WAIT_BUCKETS, waited)] += 1
+            self.wait_total += waited
+            self.overflow_peak = max(self.overflow_peak, self.overflow())
+
+    def stats(self) -> dict:
+        labels = [str(bucket) for bucket in self.WAIT_BUCKETS] + ["+Inf"]
+        return {
+            "pool_size": self.size(),
+            "checked_out": self.checkedout(),
+            "idle": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "overflow_peak": self.overflow_peak,
+            "max_overflow": self._max_overflow,
+            "timeouts": self.timeouts,
+            "wait_seconds_total": round(self.wait_total, 6),
+            "wait_histogram": dict(zip(labels, self.wait_counts)),
+        }
+
+
+def engine_options() -> dict:
+    """Общие параметры пула для мастера и реплик."""
+    return {
+        "poolclass": MonitoredQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        # первый ключ для кэша SQLAlchemy поверх asyncpg, второй для кэша самого asyncpg;
+        # за PgBouncer в режиме транзакций оба должны быть 0
+        "connect_args": {
+            "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+            "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        },
+    }
+
+
+async def warm_up(engine: AsyncEngine, count: int = settings.DB_POOL_SIZE):
+    """Открывает count соединений до приема трафика, чтобы первые запросы не платили за подключение."""
+    results = await asyncio.gather(*(engine.connect().start() for _ in range(count)), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, Exception)]
+    for connection in results:
+        if not isinstance(connection, Exception):
+            await connection.close()
+    if errors:
+        logger.warning(f"Pool warm-up for {engine.url.host} opened {count - len(errors)}/{count} connections: {errors[0]}")
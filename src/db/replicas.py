@@ -0,0 +1,114 @@
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy import text
+from fastapi import Request, Response
+import asyncio
+import time
+
+from src.db.pool import engine_options
+from src.settings import settings, logger
+
+
+PRIMARY_COOKIE = "primary_until"
+
+# Отставание реплики в секундах. Если все принятое WAL уже применено, реплика догнала мастер,
+# даже если последняя транзакция была давно.
+LAG_QUERY = text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+
+
+class ReplicaPool:
+    """
+    Реплики для чтения с фоновой проверкой здоровья. Реплика выводится из ротации, если не отвечает
+    или отстает больше REPLICA_LAG_TOLERANCE. Без здоровых реплик чтение идет в мастер.
+    """
+
+    def __init__(self, urls: list[str], lag_tolerance: float, check_interval: float):
+        self.lag_tolerance = lag_tolerance
+        self.check_interval = check_interval
+        self.engines: list[AsyncEngine] = [create_async_engine(url, **engine_options()) for url in urls]
+        self.makers = {engine: async_sessionmaker(engine) for engine in self.engines}
+        # До первой проверки состояние реплик неизвестно, читаем из мастера
+        self.healthy: list[AsyncEngine] = []
+        self.lag: dict[AsyncEngine, float | None] = {engine: None for engine in self.engines}
+        self.fallbacks = 0
+        self._next = 0
+        self._task: asyncio.Task | None = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.engines)
+
+    def session_maker(self) -> async_sessionmaker[AsyncSession] | None:
+        """Следующая здоровая реплика по кругу или None, если читать нужно из мастера."""
+        if not self.healthy:
+            if self.enabled:
+                self.fallbacks += 1
+            return None
+        self._next = (self._next + 1) % len(self.healthy)
+        return self.makers[self.healthy[self._next]]
+
+    async def _check(self, engine: AsyncEngine) -> bool:
+        try:
+            async with asyncio.timeout(self.check_interval):
+                async with engine.connect() as conn:
+                    self.lag[engine] = float(await conn.scalar(LAG_QUERY))
+        except Exception as e:
+            logger.warning(f"Replica {engine.url.host} is unavailable: {e}")
+            self.lag[engine] = None
+            return False
+        return self.lag[engine] <= self.lag_tolerance
+
+    async def check(self):
+        results = await asyncio.gather(*(self._check(engine) for engine in self.engines))
+        self.healthy = [engine for engine, ok in zip(self.engines, results) if ok]
+
+    async def _loop(self):
+        while True:
+            await self.check()
+            await asyncio.sleep(self.check_interval)
+
+    def start(self):
+        if self.enabled and self._task is None:
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        for engine in self.engines:
+            await engine.dispose()
+
+    def stats(self) -> dict:
+        return {
+            "replicas": [
+                {"host": engine.url.host, "healthy": engine in self.healthy, "lag": self.lag[engine], "pool": engine.pool.stats()}
+                for engine in self.engines
+            ],
+            "fallbacks": self.fallbacks,
+        }
+
+
+replicas = ReplicaPool(settings.DB_REPLICA_URLS, settings.REPLICA_LAG_TOLERANCE, settings.REPLICA_CHECK_INTERVAL)
+
+
+def reads_from_primary(request: Request) -> bool:
+    """Клиент недавно писал: его чтения идут в мастер, пока реплики могут не успеть догнать запись."""
+    try:
+        return float(request.cookies.get(PRIMARY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def stick_to_primary(response: Response):
+    response.set_cookie(
+        PRIMARY_COOKIE,
+        str(time.time() + replicas.lag_tolerance),
+        max_age=max(int(replicas.lag_tolerance + 1), 1),
+        httponly=True,
+    )
@@ -9,6 +9,13 @@ class NotFoundException(HTTPException):
         super().__init__(status.HTTP_404_NOT_FOUND, detail, headers)
 
     
+class AlreadyExistsException(HTTPException):
+    def __init__(self, object_name: str = None, detail = None, headers = None):
+        if detail is None and object_name:
+            detail = f"{object_name.capitalize()} already exists"
+        super().__init__(status.HTTP_400_BAD_REQUEST, detail, headers)
+
+
 class InternalServerException(HTTPException):
     def __init__(self, detail = None, headers = None):
         super().__init__(status.HTTP_500_INTERNAL_SERVER_ERROR, detail, headers)
@@ -21,4 +28,23 @@ class UnautorizedException(HTTPException):
 
 class InvalidTokenException(UnautorizedException):
     def __init__(self, detail="Invalid token data", headers={ "WWW-Authenticate": "Bearer" }):
-        super().__init__(detail, headers)
\ No newline at end of file
+        super().__init__(detail, headers)
+
+class InvalidCursorException(HTTPException):
+    def __init__(self, detail = "Invalid pagination cursor", headers = None):
+        super().__init__(status.HTTP_400_BAD_REQUEST, detail, headers)
+
+
+class PreconditionFailedException(HTTPException):
+    def __init__(self, detail = "Resource has been modified", headers = None):
+        super().__init__(status.HTTP_412_PRECONDITION_FAILED, detail, headers)
+
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, detail = None, headers = {"Retry-After": "1"}):
+        super().__init__(status.HTTP_503_SERVICE_UNAVAILABLE, detail, headers)
+
+
+class UnknownFieldsException(HTTPException):
+    def __init__(self, fields: list[str], headers = None):
+        super().__init__(status.HTTP_400_BAD_REQUEST, f"Unknown fields: {', '.join(fields)}", headers)
@@ -6,6 +6,7 @@ from src.repositories.base.abc import BaseUserRepository
 from src.api.models.user import UserResponse, UserCreate, UserCreateToDatabase
 from src.auth.token import decode_jwt
 from src.auth.hash import Hasher, get_hasher
+from src.auth.cache import token_cache
 from src.exc.api import InvalidTokenException, UnautorizedException
 from src.repositories.user import get_user_repo
 from src.repositories.base.abc import BaseAuthRepository
@@ -21,7 +22,7 @@ class AuthRepository(BaseAuthRepository):
     async def registration(self, model_create: UserCreate) -> UserResponse:
         model_dict = model_create.model_dump(exclude_unset=True)
         password = model_dict.pop("password")
-        hashed_password = self.hasher.hash(password)
+        hashed_password = await self.hasher.hash_async(password)
         model_dict.update({"hashed_password": hashed_password})
         model = UserCreateToDatabase(**model_dict)
         return await self.repo.create(model)
@@ -36,7 +37,7 @@ class AuthRepository(BaseAuthRepository):
         user: UserResponse = await self.repo.get_by_username(username)
         if not user:
             raise UnautorizedException()
-        if not self.hasher.verify(password, user.hashed_password):
+        if not await self.hasher.verify_async(password, user.hashed_password):
             raise UnautorizedException()
         return user
     
@@ -50,15 +51,23 @@ class AuthRepository(BaseAuthRepository):
 
     
     async def _get_user_from_token(self, token: str | bytes, token_type: TokenType) -> User:
+        cached = token_cache.get(token)
+        if cached:
+            payload, user = cached
+            if not payload.get("type") == token_type:
+                raise InvalidTokenException
+            return user
         try:
             payload = decode_jwt(token)
             if not payload.get("type") == token_type:
                 raise InvalidTokenException
             
             user_id = payload.get("sub")
-            return await self.repo.get(user_id)
+            user = await self.repo.get(user_id)
         except jwt.exceptions.InvalidTokenError:
             raise InvalidTokenException
+        token_cache.set(token, payload, user)
+        return user
         
 
 def get_auth_repo(
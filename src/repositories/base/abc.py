@@ -2,9 +2,11 @@ from sqlalchemy.orm import DeclarativeBase
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
 from uuid import UUID
-from typing import TypeVar
+from typing import AsyncIterator, TypeVar
 
 from src.utils.enums import TaskStatusEnum
+from src.api.models.pagination import CursorPage
+from src.api.models.batch import BatchItem, ImportResult
 
 
 TModel = TypeVar("TModel", bound=DeclarativeBase)
@@ -15,10 +17,29 @@ class BaseCrudRepository(ABC):
     async def get(self, id: UUID) -> TResponse: ...
     
     @abstractmethod
-    async def get_list(self, skip: int, limit: int, **kwargs) -> list[TResponse]: ...
+    async def get_list(self, skip: int, limit: int, projection: type[BaseModel] | None = None, **kwargs) -> list: ...
 
     @abstractmethod
-    async def update(self, model_id: UUID, model_update: BaseModel) -> TResponse: ...
+    async def get_page(
+        self, limit: int, cursor: str | None, order_by: str, projection: type[BaseModel] | None = None, **kwargs
+    ) -> CursorPage[TResponse]: ...
+
+    @abstractmethod
+    async def get_list_json(
+        self, skip: int, limit: int, cursor: str | None, order_by: str, projection: type[BaseModel] | None = None, **kwargs
+    ) -> str: ...
+
+    @abstractmethod
+    async def count(self, mode: str, **kwargs) -> int: ...
+
+    @abstractmethod
+    def stream(self, chunk_size: int, **kwargs) -> AsyncIterator[list[TResponse]]: ...
+
+    @abstractmethod
+    async def get_version(self, id: UUID) -> int | None: ...
+
+    @abstractmethod
+    async def update(self, model_id: UUID, model_update: BaseModel, versions: list[int] | None = None) -> TResponse: ...
 
     @abstractmethod
     async def delete(self, model_id: UUID) -> TResponse: ...
@@ -26,11 +47,29 @@ class BaseCrudRepository(ABC):
     @abstractmethod
     async def create(self, model_create: BaseModel) -> TResponse: ...
 
+    @abstractmethod
+    async def create_many(self, models_create: list[BaseModel]) -> list[BatchItem[TResponse]]: ...
+
+    @abstractmethod
+    async def update_many(self, models_update: list[BaseModel]) -> list[BatchItem[TResponse]]: ...
+
+    @abstractmethod
+    async def delete_many(self, model_ids: list[UUID]) -> list[BatchItem[TResponse]]: ...
+
+    @abstractmethod
+    async def import_rows(self, rows: AsyncIterator[tuple[int, str | dict]], schema: type[BaseModel]) -> ImportResult: ...
+
 
 class BaseTaskRepository(BaseCrudRepository):
     @abstractmethod
     async def get_list(self, skip: int, limit: int, status: TaskStatusEnum, user_id: UUID) -> list[TResponse]: ...
 
+    @abstractmethod
+    async def get_stats(self, owner_id: UUID | None = None) -> BaseModel: ...
+
+    @abstractmethod
+    async def search(self, q: str, limit: int, cursor: str | None, **kwargs) -> CursorPage[TResponse]: ...
+
 
 class BaseUserRepository(BaseCrudRepository):
     
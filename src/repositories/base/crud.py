@@ -1,41 +1,118 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import NoResultFound, SQLAlchemyError
-from sqlalchemy import select, update, delete
+from sqlalchemy import select, insert, update, delete, func, tuple_, values, column, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects import postgresql
+from pydantic import BaseModel, ValidationError
+from pydantic_core import to_json
 from redis import Redis
-from datetime import timedelta
+from collections import Counter, defaultdict
 from typing import Type
+from enum import Enum
+import hashlib
+import json
+import time
 
 from src.repositories.base.abc import BaseCrudRepository, TModel, TResponse
-from src.exc.api import NotFoundException
-from src.settings import logger
+from src.api.models.pagination import CursorPage
+from src.api.models.batch import BatchItem, ImportResult, ImportRowError
+from src.exc.api import NotFoundException, InvalidCursorException, AlreadyExistsException, PreconditionFailedException
+from src.utils.cursor import encode_cursor, decode_cursor
+from src.utils.importing import RowError
+from src.cache import object_cache, single_flight, CacheEntry
+from src.db.replicas import replicas
+from src.settings import settings, logger
+
+
+# Запись промаха в кэш: только если с момента чтения кэша объект никто не менял (эпоха ключа та же).
+# Иначе загрузка, прочитавшая строку до коммита записи, вернула бы в кэш старое значение поверх нового.
+POPULATE_SCRIPT = """
+if (redis.call('GET', KEYS[3]) or '') ~= ARGV[1] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[4])
+redis.call('SET', KEYS[2], ARGV[3], 'EX', ARGV[4])
+return 1
+"""
+
+# Поле-метка в хеше счетчиков: хеш записан пересчетом из базы. Без нее хеш пропал (сброс, вытеснение)
+# или собран одними HINCRBY поверх пустоты, и верить ему нельзя.
+COUNTERS_MARK = "_reconciled"
 
 
 class CrudRepository(BaseCrudRepository):
 
     model: Type[TModel]
     response_model: Type[TResponse]
+    sort_fields: tuple[str, ...] = ("id",)
+    list_scope: str | None = None
+    counter_field: str | None = None
 
-    def __init__(self, session: AsyncSession, redis: Redis):
+    def __init__(self, session: AsyncSession, redis: Redis, read_session: AsyncSession | None = None):
         if not self.model or not self.response_model:
             raise ValueError("Not exist model or response model")
         self.session = session
+        self.read_session = read_session or session
         self.cache = redis
+        self._read_primary = False
+
+    @property
+    def reader(self) -> AsyncSession:
+        """Сессия для чтений: реплика, пока запрос не наткнулся на свежую запись, после этого мастер."""
+        return self.session if self._read_primary else self.read_session
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.model.__name__}_generation"
+
+    def _key(self, id) -> str:
+        return f"{self.model.__name__}_{id}"
+
+    def _version_key(self, id) -> str:
+        return f"{self._key(id)}_version"
 
+    def _epoch_key(self, id) -> str:
+        return f"{self._key(id)}_epoch"
 
     async def get(self, id):
-        key = f"{self.model.__name__}_{id}"
-        cached = await self.cache.get(key)
-        if cached:
-            model = self.response_model.model_validate_json(cached)
+        model = object_cache.get_local(self.model.__name__, id)
+        if model is not None:
             return model
+        key = self._key(id)
+        generation, cached, written, epoch = await self.cache.mget(
+            self._generation_key, key, f"{key}_written", self._epoch_key(id)
+        )
+        generation = generation or "0"
+        self._read_primary = self._read_primary or bool(written)
+        entry = CacheEntry.unpack(cached, generation)
+        if entry is None:
+            object_cache.remote_misses += 1
+        else:
+            object_cache.remote_hits += 1
+            if not (entry.should_refresh(settings.CACHE_EARLY_REFRESH_BETA) and await self._lock_refresh(key)):
+                model = self.response_model.model_validate_json(entry.value)
+                object_cache.set_local(self.model.__name__, id, model, len(entry.value))
+                return model
+        return await single_flight.do(key, lambda: self._load(id, generation, epoch))
+
+    async def _lock_refresh(self, key: str) -> bool:
+        """Только один воркер пересобирает ключ заранее, остальные пока отдают кэш."""
+        return bool(await self.cache.set(f"{key}_refresh", "1", px=settings.CACHE_REFRESH_LOCK_MS, nx=True))
+
+    async def _load(self, id, generation: str, epoch: str | None):
+        """epoch прочитан до запроса в базу: если с тех пор объект изменили, результат в кэш не пишется."""
+        started = time.monotonic()
         model = await self._get(id)
         val = model.model_dump_json()
-        await self.cache.set(key, val, timedelta(hours=1))
+        entry = CacheEntry(generation, time.time() + settings.CACHE_TTL, time.monotonic() - started, val)
+        keys = (self._key(id), self._version_key(id), self._epoch_key(id))
+        if await self.cache.eval(POPULATE_SCRIPT, len(keys), *keys, epoch or "", entry.pack(), model.version, settings.CACHE_TTL):
+            object_cache.set_local(self.model.__name__, id, model, len(val))
         return model
 
     async def _get(self, id):
         try:
-            task = await self.session.get_one(self.model, id)
+            task = await self.reader.get_one(self.model, id)
             return self.response_model.model_validate(task, from_attributes=True)
         except NoResultFound:
             raise NotFoundException(self.model.__name__)
@@ -43,55 +120,633 @@ class CrudRepository(BaseCrudRepository):
             logger.error(f"Error with get {self.model.__name__}: {e}")
             raise
 
-    async def get_list(self, skip=0, limit=50, **filters):
+    async def _cache_write(self, model: TResponse):
+        """Запись после коммита: новая эпоха отменяет запись промахов, которые успели прочитать старую строку."""
+        generation = await self.cache.get(self._generation_key) or "0"
+        val = model.model_dump_json()
+        entry = CacheEntry(generation, time.time() + settings.CACHE_TTL, 0, val)
+        async with self.cache.pipeline(transaction=False) as pipe:
+            self._bump_epochs(pipe, [model.id])
+            pipe.set(self._key(model.id), entry.pack(), ex=settings.CACHE_TTL)
+            pipe.set(self._version_key(model.id), model.version, ex=settings.CACHE_TTL)
+            await pipe.execute()
+        object_cache.set_local(self.model.__name__, model.id, model, len(val))
+
+    def _bump_epochs(self, pipe, ids):
+        for id in ids:
+            pipe.incr(self._epoch_key(id))
+            pipe.expire(self._epoch_key(id), settings.CACHE_TTL)
+
+    async def _cache_drop(self, ids):
+        async with self.cache.pipeline(transaction=False) as pipe:
+            self._bump_epochs(pipe, ids)
+            pipe.delete(*[self._key(id) for id in ids], *[self._version_key(id) for id in ids])
+            await pipe.execute()
+
+    async def get_version(self, id) -> int | None:
+        """Версия объекта без чтения строки и разбора JSON: из локального кэша или отдельного ключа в Redis."""
+        model = object_cache.get_local(self.model.__name__, id)
+        if model is not None:
+            return model.version
+        version = await self.cache.get(self._version_key(id))
+        return int(version) if version else None
+
+    async def invalidate_all(self):
+        """Делает недостижимыми все закэшированные объекты модели, не перебирая ключи."""
+        await self.cache.incr(self._generation_key)
+        await self._bump_list_generations()
+        await object_cache.changed(self.cache, self.model.__name__)
+
+    def _scope_of(self, model: TResponse):
+        return getattr(model, self.list_scope) if self.list_scope else None
+
+    def _apply_filters(self, query, filters: dict):
+        for field, value in filters.items():
+            if value is not None and hasattr(self.model, field):
+                query = query.where(getattr(self.model, field) == value)
+        return query
+
+    def _select(self, projection: Type[BaseModel] | None = None, *keys):
+        """SELECT всей модели или только колонок проекции и ключей сортировки."""
+        if projection is None:
+            return select(self.model)
+        columns = [getattr(self.model, name) for name in projection.model_fields]
+        return select(*columns, *(key for key in keys if key.key not in projection.model_fields))
+
+    async def _rows(self, query, projection: Type[BaseModel] | None = None) -> list:
+        if projection is None:
+            return (await self.reader.scalars(query)).all()
+        return (await self.reader.execute(query)).all()
+
+    async def get_list(self, skip=0, limit=50, projection=None, **filters):
+        """Без projection возвращает объекты модели, с ней строки только с ее колонками."""
         try:
-            query = select(self.model).offset(skip).limit(limit)
-
-            for field, value in filters.items():
-                if value is not None and hasattr(self.model, field):
-                    query = query.where(getattr(self.model, field) == value)
-            
-            result = await self.session.scalars(query)
-            return result.all()
+            query = self._apply_filters(self._select(projection).offset(skip).limit(limit), filters)
+            return await self._rows(query, projection)
              
         except SQLAlchemyError as e:
             logger.error(f"Error with get_list {self.model.__name__}: {e}")
             raise
 
-    async def update(self, model_id, model_update):
+    async def get_page(self, limit=50, cursor=None, order_by="id", projection=None, **filters):
+        if order_by not in self.sort_fields:
+            raise InvalidCursorException(f"Sorting by {order_by} is not supported")
+        if limit < 1:
+            raise InvalidCursorException("Limit must be positive")
+        keys = [getattr(self.model, order_by)] if order_by == "id" else [getattr(self.model, order_by), self.model.id]
+        try:
+            query = self._apply_filters(self._select(projection, *keys), filters)
+            if cursor:
+                values = decode_cursor(cursor, order_by, [key.type.python_type for key in keys])
+                query = query.where(tuple_(*keys) > tuple_(*values))
+            query = query.order_by(*keys).limit(limit + 1)
+            rows = await self._rows(query, projection)
+        except SQLAlchemyError as e:
+            logger.error(f"Error with get_page {self.model.__name__}: {e}")
+            raise
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(order_by, [getattr(rows[-1], key.key) for key in keys])
+        projection = projection or self.response_model
+        items = [projection.model_validate(row, from_attributes=True) for row in rows]
+        return CursorPage[projection](items=items, next_cursor=next_cursor)
+
+    async def stream(self, chunk_size=None, **filters):
+        """
+        Отдает все подходящие строки пачками через серверный курсор:
+        в памяти одновременно не больше chunk_size объектов, сколько бы строк ни было в таблице.
+        """
+        chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+        query = self._apply_filters(select(self.model), filters).order_by(self.model.id)
+        try:
+            result = await self.session.stream_scalars(query.execution_options(yield_per=chunk_size))
+            async for rows in result.partitions():
+                yield [self.response_model.model_validate(row) for row in rows]
+        except SQLAlchemyError as e:
+            logger.error(f"Error with stream {self.model.__name__}: {e}")
+            raise
+
+    def _list_generation_key(self, scope=None) -> str:
+        if scope is None:
+            return f"{self.model.__name__}_list_generation"
+        return f"{self.model.__name__}_list_generation_{self.list_scope}_{scope}"
+
+    async def _bump_list_generations(self, *scopes):
+        keys = {self._list_generation_key()}
+        keys.update(self._list_generation_key(scope) for scope in scopes if scope is not None)
+        async with self.cache.pipeline(transaction=False) as pipe:
+            for key in keys:
+                pipe.incr(key)
+                if replicas.enabled:
+                    pipe.set(f"{key}_written", "1", px=int(replicas.lag_tolerance * 1000))
+            await pipe.execute()
+
+    async def _list_cache_get(self, scope, key: str) -> tuple[str, str | None]:
+        """
+        Поколение списка и значение из кэша, если оно сделано в этом поколении. В поколение входит и поколение
+        объектов модели: его поднимает invalidate_all, и так устаревают списки всех владельцев сразу.
+        """
+        generation_key = self._list_generation_key(scope)
+        epoch, generation, cached, written = await self.cache.mget(
+            self._generation_key, generation_key, key, f"{generation_key}_written"
+        )
+        self._read_primary = self._read_primary or bool(written)
+        generation = f"{epoch or '0'}.{generation or '0'}"
+        if cached:
+            cached_generation, _, value = cached.partition(":")
+            if cached_generation == generation:
+                return generation, value
+        return generation, None
+
+    async def _mark_written(self, ids):
+        """
+        Пока реплики могут отставать, промах кэша по только что записанному объекту читается из мастера:
+        иначе устаревшая строка с реплики попала бы в кэш под новым поколением.
+        """
+        if not replicas.enabled or not ids:
+            return
+        async with self.cache.pipeline(transaction=False) as pipe:
+            for id in ids:
+                pipe.set(f"{self._key(id)}_written", "1", px=int(replicas.lag_tolerance * 1000))
+            await pipe.execute()
+
+    async def get_list_json(self, skip=0, limit=50, cursor=None, order_by="id", projection=None, **filters) -> str:
+        """
+        Страница списка как готовый JSON для ответа. Кэшируется в Redis до следующей записи:
+        списки с фильтром по list_scope зависят от поколения своего владельца, остальные от поколения модели.
+        projection задает модель ответа, из базы читаются только ее колонки.
+        """
+        filters = {field: value for field, value in filters.items() if value is not None}
+        scope = filters.get(self.list_scope) if self.list_scope else None
+        fields = list(projection.model_fields) if projection else None
+        params = json.dumps(
+            {"skip": skip, "limit": limit, "cursor": cursor, "order_by": order_by, "filters": filters, "fields": fields},
+            sort_keys=True,
+            default=str,
+        )
+        key = f"{self.model.__name__}_list_{hashlib.sha256(params.encode()).hexdigest()}"
+        generation, body = await self._list_cache_get(scope, key)
+        if body is not None:
+            return body
+
+        if cursor is not None:
+            body = (await self.get_page(limit, cursor, order_by, projection, **filters)).model_dump_json()
+        else:
+            rows = await self.get_list(skip, limit, projection, **filters)
+            projection = projection or self.response_model
+            body = to_json([projection.model_validate(row, from_attributes=True) for row in rows]).decode()
+        await self.cache.set(key, f"{generation}:{body}", settings.LIST_CACHE_TTL)
+        return body
+
+    async def count(self, mode="exact", **filters) -> int:
+        """
+        Сколько строк подходит под фильтры. Точное значение кэшируется до следующей записи так же, как страницы списка,
+        оценка берется у планировщика и в кэше не нуждается.
+        """
+        filters = {field: value for field, value in filters.items() if value is not None}
+        if mode == "estimated":
+            return await self._estimate_count(filters)
+        scope = filters.get(self.list_scope) if self.list_scope else None
+        params = json.dumps(filters, sort_keys=True, default=str)
+        key = f"{self.model.__name__}_count_{hashlib.sha256(params.encode()).hexdigest()}"
+        generation, total = await self._list_cache_get(scope, key)
+        if total is not None:
+            return int(total)
+        try:
+            total = await self.reader.scalar(self._apply_filters(select(func.count()).select_from(self.model), filters))
+        except SQLAlchemyError as e:
+            logger.error(f"Error with count {self.model.__name__}: {e}")
+            raise
+        await self.cache.set(key, f"{generation}:{total}", settings.LIST_CACHE_TTL)
+        return total
+
+    async def _estimate_count(self, filters: dict) -> int:
+        """Без фильтров число строк из статистики таблицы, с фильтрами ожидаемое число строк из EXPLAIN."""
+        try:
+            if not filters:
+                # у партиционированной таблицы статистика хранится по партициям; обычная таблица сама себе лист.
+                # Неанализированная таблица это reltuples = -1 с Postgres 14 и reltuples = 0 при relpages = 0 до него:
+                # тогда, как и для пустой статистики, оценку дает EXPLAIN по реальному размеру файлов
+                estimate = await self.reader.scalar(
+                    text(
+                        "SELECT CASE WHEN bool_and(c.reltuples >= 0 AND c.relpages > 0) THEN sum(c.reltuples) END "
+                        "FROM pg_partition_tree(CAST(:table AS regclass)) t JOIN pg_class c ON c.oid = t.relid "
+                        "WHERE t.isleaf"
+                    ),
+                    {"table": self.model.__tablename__},
+                )
+                if estimate is not None:
+                    return int(estimate)
+            query = self._apply_filters(select(self.model.id), filters).compile(
+                dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True}
+            )
+            connection = await self.reader.connection()
+            plan = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {query}")).scalar()
+        except SQLAlchemyError as e:
+            logger.error(f"Error with estimate count {self.model.__name__}: {e}")
+            raise
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _tracked_fields(self) -> set[str]:
+        """Поля, от которых зависят списки и счетчики: при их изменении нужны старые значения."""
+        return {field for field in (self.list_scope, self.counter_field) if field}
+
+    def _tracked_columns(self) -> list:
+        return [getattr(self.model, field) for field in sorted(self._tracked_fields())]
+
+    def _counter_key(self, scope=None) -> str:
+        if scope is None:
+            return f"{self.model.__name__}_counters"
+        return f"{self.model.__name__}_counters_{self.list_scope}_{scope}"
+
+    def _tally(self, item) -> tuple:
+        if not isinstance(item, dict):
+            item = {field: getattr(item, field) for field in self._tracked_fields()}
+        value = item.get(self.counter_field) if self.counter_field else None
+        return item.get(self.list_scope) if self.list_scope else None, value.value if isinstance(value, Enum) else value
+
+    def _deltas(self, added=(), removed=()) -> Counter:
+        """Изменение счетчиков по паре (scope, значение counter_field)."""
+        deltas = Counter(self._tally(item) for item in added)
+        deltas.subtract(self._tally(item) for item in removed)
+        return deltas
+
+    async def _count(self, deltas: Counter):
+        """
+        Сдвигает счетчики в Redis-хешах: общий по модели и по каждому scope.
+        Вызывается после коммита, расхождения при сбоях между ними исправляет reconcile_counters.
+        """
+        if not self.counter_field:
+            return
+        async with self.cache.pipeline(transaction=False) as pipe:
+            for (scope, value), delta in deltas.items():
+                if not delta:
+                    continue
+                pipe.hincrby(self._counter_key(), str(value), delta)
+                if scope is not None:
+                    pipe.hincrby(self._counter_key(scope), str(value), delta)
+            await pipe.execute()
+
+    async def get_counters(self, scope=None) -> dict[str, int]:
+        """
+        Счетчики одним HGETALL: число полей ограничено значениями counter_field, а не числом строк.
+        Если хеш не помечен пересчетом, считает этот scope GROUP BY и записывает результат.
+        """
+        if not self.counter_field:
+            return {}
+        counters = await self.cache.hgetall(self._counter_key(scope))
+        if COUNTERS_MARK not in counters:
+            counters = (await self._group_counters(scope))[None]
+            async with self.cache.pipeline(transaction=True) as pipe:
+                self._write_counters(pipe, scope, counters)
+                await pipe.execute()
+        return {field: int(count) for field, count in counters.items() if field != COUNTERS_MARK}
+
+    async def _group_counters(self, scope=None) -> dict:
+        """GROUP BY по scope и counter_field: счетчики общего хеша (ключ None) и каждого scope."""
+        scope_column = getattr(self.model, self.list_scope) if self.list_scope else None
+        group = [column for column in (scope_column, getattr(self.model, self.counter_field)) if column is not None]
+        query = select(*group, func.count()).group_by(*group)
+        if scope is not None:
+            query = query.where(scope_column == scope)
+        try:
+            rows = (await self.session.execute(query)).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error with counters {self.model.__name__}: {e}")
+            raise
+
+        counters = defaultdict(Counter)
+        for row in rows:
+            *row_scope, value, count = row
+            value = value.value if isinstance(value, Enum) else value
+            counters[None][str(value)] += count
+            if row_scope:
+                counters[row_scope[0]][str(value)] += count
+        return counters
+
+    def _write_counters(self, pipe, scope, counts):
+        key = self._counter_key(scope)
+        pipe.delete(key)
+        pipe.hset(key, mapping={**counts, COUNTERS_MARK: 1})
+
+    async def reconcile_counters(self) -> int:
+        """
+        Пересчитывает счетчики одним GROUP BY и перезаписывает хеши.
+        Записи, идущие во время пересчета, могут сдвинуть результат на единицы, их выправит следующий запуск.
+        Возвращает число перезаписанных хешей.
+        """
+        if not self.counter_field:
+            return 0
+        counters = await self._group_counters()
+        counters.setdefault(None, Counter())
+
+        stale = set()
+        if self.list_scope:
+            async for key in self.cache.scan_iter(match=self._counter_key("*")):
+                stale.add(key)
+        async with self.cache.pipeline(transaction=True) as pipe:
+            for scope, counts in counters.items():
+                stale.discard(self._counter_key(scope))
+                self._write_counters(pipe, scope, counts)
+            for key in stale:
+                pipe.delete(key)
+            await pipe.execute()
+        return len(counters)
+
+    async def update(self, model_id, model_update, versions=None):
+        """
+        versions из If-Match включает оптимистичную блокировку: строка обновится, только если ее версия среди них,
+        без предварительного чтения. Проверка существования нужна лишь затем, чтобы отличить 412 от 404.
+        """
         try:
             async with self.session.begin():
                 update_data = model_update.model_dump(exclude_unset=True)
-                query = update(self.model).where(self.model.id == model_id).values(**update_data).returning(self.model)
-                result = await self.session.execute(query)
-                return self.response_model.model_validate(result.scalar_one())
-        except NoResultFound:
-            raise NotFoundException(self.model.__name__)
+                old = None
+                if self._tracked_fields() & update_data.keys():
+                    old = (await self.session.execute(
+                        select(*self._tracked_columns()).where(self.model.id == model_id).with_for_update()
+                    )).one_or_none()
+                    old = old and dict(old._mapping)
+                query = update(self.model).where(self.model.id == model_id)
+                if versions is not None:
+                    query = query.where(self.model.version.in_(versions))
+                query = query.values(**update_data, version=self.model.version + 1).returning(self.model)
+                updated = (await self.session.execute(query)).scalar_one_or_none()
+                if updated is None:
+                    if versions is not None and await self.session.scalar(select(self.model.id).where(self.model.id == model_id)):
+                        raise PreconditionFailedException()
+                    raise NotFoundException(self.model.__name__)
+                model = self.response_model.model_validate(updated)
         except SQLAlchemyError as e:
             logger.error(f"Error with update {self.model.__name__} {model_id}: {e}")
             raise
+        await self._cache_write(model)
+        await self._mark_written([model_id])
+        await object_cache.changed(self.cache, self.model.__name__, model_id)
+        await self._bump_list_generations(old and old.get(self.list_scope), self._scope_of(model))
+        if old:
+            await self._count(self._deltas(added=[model], removed=[old]))
+        return model
 
     async def delete(self, model_id):
         try:
             async with self.session.begin():
                 query = delete(self.model).where(self.model.id == model_id).returning(self.model)
                 result = await self.session.execute(query)
-                return self.response_model.model_validate(result.scalar_one())
+                model = self.response_model.model_validate(result.scalar_one())
         except NoResultFound as e:
             raise NotFoundException(self.model.__name__)
         except SQLAlchemyError as e:
             logger.error(f"Error with delete {self.model.__name__} {model_id}: {e}")
             raise
+        await self._cache_drop([model_id])
+        await self._mark_written([model_id])
+        await object_cache.changed(self.cache, self.model.__name__, model_id)
+        await self._bump_list_generations(self._scope_of(model))
+        await self._count(self._deltas(removed=[model]))
+        return model
+
+    async def _batch_errors(self, rows: list[dict]) -> dict[int, tuple[int, str]]:
+        """Ошибки отдельных строк пачки, которые нужно отсечь до записи: индекс -> (статус, описание)."""
+        return {}
+
+    async def _batch_changed(self, ids: list, scopes: set):
+        if ids:
+            await self._cache_drop(ids)
+            await self._mark_written(ids)
+            await object_cache.changed_many(self.cache, self.model.__name__, ids)
+        await self._bump_list_generations(*scopes)
+
+    async def create_many(self, models_create):
+        rows = [model.model_dump() for model in models_create]
+        try:
+            async with self.session.begin():
+                errors = await self._batch_errors(rows)
+                valid = [index for index in range(len(rows)) if index not in errors]
+                created = []
+                if valid:
+                    query = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+                    created = (await self.session.scalars(query, [rows[index] for index in valid])).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error with create_many {self.model.__name__}: {e}")
+            raise
 
-    async def create(self, model_create):
+        results = [BatchItem(index=index, status=status, detail=detail) for index, (status, detail) in errors.items()]
+        models = [self.response_model.model_validate(row) for row in created]
+        results.extend(BatchItem(index=index, status=201, item=model) for index, model in zip(valid, models))
+        await self._mark_written([model.id for model in models])
+        await self._batch_changed([], {self._scope_of(model) for model in models})
+        await self._count(self._deltas(added=models))
+        return sorted(results, key=lambda result: result.index)
+
+    def _update_errors(self, rows: list[dict]) -> dict[int, tuple[int, str]]:
+        """
+        Строки пачки обновления, которые нельзя отправлять в базу: повтор уже встреченного id
+        (UPDATE ... FROM VALUES применил бы одну из них наугад) и null в NOT NULL колонке.
+        """
+        errors, seen = {}, set()
+        columns = self.model.__table__.c
+        for index, row in enumerate(rows):
+            nulls = [field for field, value in row.items() if value is None and not columns[field].nullable]
+            if row["id"] in seen:
+                errors[index] = (422, "Duplicate id in batch")
+            elif nulls:
+                errors[index] = (422, f"Fields cannot be null: {', '.join(nulls)}")
+            seen.add(row["id"])
+        return errors
+
+    async def update_many(self, models_update):
+        rows = [model.model_dump(exclude_unset=True) for model in models_update]
+        groups = defaultdict(list)
+        for index, row in enumerate(rows):
+            groups[tuple(sorted(field for field in row if field != "id"))].append(index)
+
+        updated = {}
         try:
-            new_model_dict = model_create.model_dump(exclude_unset=True)
-            new_model = self.model(**new_model_dict)
-            self.session.add(new_model)
+            async with self.session.begin():
+                errors = await self._batch_errors(rows)
+                errors.update({index: (422, "Nothing to update") for index in groups.pop((), [])})
+                errors.update(self._update_errors(rows))
+                old = {}
+                tracked = self._tracked_fields()
+                moved = [row["id"] for index, row in enumerate(rows) if tracked & row.keys() and index not in errors]
+                if moved:
+                    result = await self.session.execute(
+                        select(self.model.id, *self._tracked_columns()).where(self.model.id.in_(moved)).with_for_update()
+                    )
+                    old = {row.id: dict(row._mapping) for row in result}
+                for fields, indexes in groups.items():
+                    indexes = [index for index in indexes if index not in errors]
+                    names = ("id", *fields)
+                    columns = [column(name, self.model.__table__.c[name].type) for name in names]
+                    for start in range(0, len(indexes), settings.BATCH_CHUNK_SIZE):
+                        chunk = indexes[start:start + settings.BATCH_CHUNK_SIZE]
+                        batch = values(*columns, name="batch").data([tuple(rows[index][name] for name in names) for index in chunk])
+                        query = (
+                            update(self.model)
+                            .where(self.model.id == batch.c.id)
+                            .values({**{field: batch.c[field] for field in fields}, "version": self.model.version + 1})
+                            .returning(self.model)
+                            .execution_options(synchronize_session=False)
+                        )
+                        for row in (await self.session.scalars(query)).all():
+                            updated[row.id] = self.response_model.model_validate(row)
+        except SQLAlchemyError as e:
+            logger.error(f"Error with update_many {self.model.__name__}: {e}")
+            raise
+
+        results = []
+        for index, row in enumerate(rows):
+            if index in errors:
+                status, detail = errors[index]
+                results.append(BatchItem(index=index, status=status, detail=detail))
+            elif row["id"] in updated:
+                results.append(BatchItem(index=index, status=200, item=updated[row["id"]]))
+            else:
+                results.append(BatchItem(index=index, status=404, detail=f"{self.model.__name__} not found"))
+        scopes = {row.get(self.list_scope) for row in old.values()} | {self._scope_of(model) for model in updated.values()}
+        await self._batch_changed(list(updated), scopes)
+        moved = [id for id in old if id in updated]
+        await self._count(self._deltas(added=[updated[id] for id in moved], removed=[old[id] for id in moved]))
+        return results
+
+    async def delete_many(self, model_ids):
+        deleted = {}
+        try:
+            async with self.session.begin():
+                for start in range(0, len(model_ids), settings.BATCH_CHUNK_SIZE):
+                    chunk = model_ids[start:start + settings.BATCH_CHUNK_SIZE]
+                    query = (
+                        delete(self.model)
+                        .where(self.model.id.in_(chunk))
+                        .returning(self.model)
+                        .execution_options(synchronize_session=False)
+                    )
+                    for row in (await self.session.scalars(query)).all():
+                        deleted[row.id] = self.response_model.model_validate(row)
+        except SQLAlchemyError as e:
+            logger.error(f"Error with delete_many {self.model.__name__}: {e}")
+            raise
+
+        results = [
+            BatchItem(index=index, status=200, item=deleted[model_id]) if model_id in deleted
+            else BatchItem(index=index, status=404, detail=f"{self.model.__name__} not found")
+            for index, model_id in enumerate(model_ids)
+        ]
+        await self._batch_changed(list(deleted), {self._scope_of(model) for model in deleted.values()})
+        await self._count(self._deltas(removed=deleted.values()))
+        return results
+
+    def _copy_columns(self) -> list:
+        """Колонки, которые пишет COPY: генерируемые базой пропускаются."""
+        return [column for column in self.model.__table__.columns if column.computed is None]
+
+    def _copy_record(self, data: dict) -> tuple:
+        """Строка для COPY в порядке колонок таблицы: пропущенные поля берут Python-значения по умолчанию."""
+        record = []
+        for column in self._copy_columns():
+            if column.name in data:
+                value = data[column.name]
+            elif column.default is not None:
+                value = column.default.arg(None) if column.default.is_callable else column.default.arg
+            else:
+                value = None
+            record.append(value.name if isinstance(value, Enum) else value)
+        return tuple(record)
+
+    async def _copy_chunk(self, chunk: list[tuple[int, str | dict | RowError]], schema: Type[BaseModel], result: dict) -> set:
+        rows, numbers = [], []
+        for number, raw in chunk:
+            if isinstance(raw, RowError):
+                self._import_error(result, number, 422, raw.detail)
+                continue
+            try:
+                model = schema.model_validate_json(raw) if isinstance(raw, str) else schema.model_validate(raw)
+            except ValidationError as e:
+                error = e.errors()[0]
+                self._import_error(result, number, 422, f"{'.'.join(map(str, error['loc']))}: {error['msg']}")
+                continue
+            rows.append(model.model_dump())
+            numbers.append(number)
+
+        errors = await self._batch_errors(rows)
+        for index, (status, detail) in errors.items():
+            self._import_error(result, numbers[index], status, detail)
+        valid = [row for index, row in enumerate(rows) if index not in errors]
+        if valid:
+            connection = await (await self.session.connection()).get_raw_connection()
+            await connection.driver_connection.copy_records_to_table(
+                self.model.__tablename__,
+                records=[self._copy_record(row) for row in valid],
+                columns=[column.name for column in self._copy_columns()],
+            )
+        result["imported"] += len(valid)
+        return self._deltas(added=valid)
+
+    @staticmethod
+    def _import_error(result: dict, number: int, status: int, detail: str):
+        result["failed"] += 1
+        if len(result["errors"]) < settings.IMPORT_MAX_ERRORS:
+            result["errors"].append(ImportRowError(row=number, status=status, detail=detail))
+
+    async def import_rows(self, rows, schema):
+        """
+        Загружает поток строк через COPY пачками по IMPORT_CHUNK_SIZE в одной транзакции.
+        Невалидные строки пропускаются и попадают в отчет, в памяти держится только текущая пачка.
+        """
+        started = time.monotonic()
+        result = {"imported": 0, "failed": 0, "errors": []}
+        deltas = Counter()
+        try:
+            chunk = []
+            async for row in rows:
+                chunk.append(row)
+                if len(chunk) >= settings.IMPORT_CHUNK_SIZE:
+                    deltas.update(await self._copy_chunk(chunk, schema, result))
+                    chunk = []
+            if chunk:
+                deltas.update(await self._copy_chunk(chunk, schema, result))
             await self.session.commit()
-            await self.session.refresh(new_model)
-            return new_model
         except Exception as e:
-            logger.error(f"Error with create {self.model.__name__}: {e}")
+            logger.error(f"Error with import_rows {self.model.__name__}: {e}")
             await self.session.rollback()
-            raise
\ No newline at end of file
+            raise
+
+        if result["imported"]:
+            await self._bump_list_generations(*{scope for scope, _ in deltas})
+            await self._count(deltas)
+        seconds = time.monotonic() - started
+        return ImportResult(
+            **result,
+            seconds=round(seconds, 3),
+            rows_per_second=round(result["imported"] / seconds, 1) if seconds else 0.0,
+        )
+
+    async def create(self, model_create):
+        """
+        Один INSERT ... ON CONFLICT DO NOTHING RETURNING: без refresh и без предварительной проверки.
+        Пустой RETURNING значит, что сработало одно из ограничений уникальности.
+        """
+        query = (
+            pg_insert(self.model)
+            .values(**model_create.model_dump(exclude_unset=True))
+            .on_conflict_do_nothing()
+            .returning(self.model)
+        )
+        try:
+            async with self.session.begin():
+                created = (await self.session.scalars(query)).one_or_none()
+                model = created and self.response_model.model_validate(created)
+        except SQLAlchemyError as e:
+            logger.error(f"Error with create {self.model.__name__}: {e}")
+            raise
+        if model is None:
+            raise AlreadyExistsException(self.model.__name__)
+        await self._cache_write(model)
+        await self._bump_list_generations(self._scope_of(model))
+        await self._count(self._deltas(added=[model]))
+        return model
\ No newline at end of file
@@ -1,24 +1,92 @@
 from fastapi import Depends
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy import select, func, or_, and_
 from typing import Annotated
+from uuid import UUID
+import re
 
 from src.repositories.base.abc import BaseTaskRepository
 from src.repositories.base.crud import CrudRepository
-from src.api.models.task import TaskResponse
-from src.db import Task, get_async_session
+from src.api.models.task import TaskResponse, TaskStats
+from src.api.models.pagination import CursorPage
+from src.exc.api import InvalidCursorException
+from src.utils.cursor import encode_cursor, decode_cursor
+from src.utils.enums import TaskStatusEnum
+from src.db import Task, User, get_async_session, get_read_session
+from src.db.models import SEARCH_CONFIG
 from src.utils.redis import Redis, get_redis
+from src.settings import logger
 
 
 __all__ = ["TaskRepository", "BaseTaskRepository", "get_task_repo"]
 
 
+SEARCH_TERM = re.compile(r"\w+")
+
+
 class TaskRepository(CrudRepository, BaseTaskRepository):
     model = Task
     response_model = TaskResponse
+    sort_fields = ("id", "name")
+    list_scope = "owner_id"
+    counter_field = "status"
+
+    async def get_stats(self, owner_id=None):
+        counters = await self.get_counters(owner_id)
+        by_status = {status: max(counters.get(status.value, 0), 0) for status in TaskStatusEnum}
+        return TaskStats(total=sum(by_status.values()), by_status=by_status)
+
+    @staticmethod
+    def _search_query(q: str) -> str | None:
+        """Каждое слово запроса ищется как префикс, все слова должны встретиться: "куп мол" -> "куп:* & мол:*"."""
+        terms = SEARCH_TERM.findall(q.lower())
+        return " & ".join(f"{term}:*" for term in terms) if terms else None
+
+    async def search(self, q, limit=50, cursor=None, **filters):
+        """
+        Полнотекстовый поиск по названию и описанию через GIN-индекс на search_vector.
+        Совпадения в названии весят больше, страницы идут по убыванию релевантности, при равной по id.
+        """
+        if limit < 1:
+            raise InvalidCursorException("Limit must be positive")
+        tsquery = self._search_query(q)
+        if tsquery is None:
+            return CursorPage[TaskResponse](items=[])
+        query_vector = func.to_tsquery(SEARCH_CONFIG, tsquery)
+        rank = func.ts_rank_cd(Task.search_vector, query_vector)
+        try:
+            query = self._apply_filters(select(Task, rank).where(Task.search_vector.op("@@")(query_vector)), filters)
+            if cursor:
+                last_rank, last_id = decode_cursor(cursor, "rank", [float, UUID])
+                query = query.where(or_(rank < last_rank, and_(rank == last_rank, Task.id > last_id)))
+            rows = (await self.reader.execute(query.order_by(rank.desc(), Task.id).limit(limit + 1))).all()
+        except SQLAlchemyError as e:
+            logger.error(f"Error with search {self.model.__name__}: {e}")
+            raise
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor("rank", [rows[-1][1], rows[-1][0].id])
+        items = [TaskResponse.model_validate(task) for task, _ in rows]
+        return CursorPage[TaskResponse](items=items, next_cursor=next_cursor)
+
+    async def _batch_errors(self, rows):
+        owner_ids = {row["owner_id"] for row in rows if row.get("owner_id")}
+        if not owner_ids:
+            return {}
+        existing = set(await self.session.scalars(select(User.id).where(User.id.in_(owner_ids))))
+        return {
+            index: (404, "User not found")
+            for index, row in enumerate(rows)
+            if row.get("owner_id") and row["owner_id"] not in existing
+        }
 
 
 def get_task_repo(
         session: Annotated[AsyncSession, Depends(get_async_session)],
         redis: Annotated[Redis, Depends(get_redis)],
+        read_session: Annotated[AsyncSession, Depends(get_read_session)],
     ) -> BaseTaskRepository:
-    return TaskRepository(session, redis)
+    return TaskRepository(session, redis, read_session)
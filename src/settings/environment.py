@@ -8,6 +8,8 @@ BASE_DIR = Path(__file__).parent.parent.parent
 class AuthJWT(BaseModel):
     public_key: Path = BASE_DIR / "certs" / "public.pem"
     private_key: Path = BASE_DIR / "certs" / "private.pem"
+    rotated_keys_dir: Path = BASE_DIR / "certs" / "rotated"
+    key_reload_interval: int = 5
     algorithm: str = "RS256"
     access_token_expire_minutes: int = 15
     verification_token_expire_minutes: int = 5
@@ -35,6 +37,17 @@ class Settings(BaseSettings):
     DB_NAME: str
     TEST_DB_HOST: str
     TEST_DB_NAME: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_WARMUP: bool = True
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    TASK_PARTITIONS: int = 16
+    DB_REPLICA_URLS: list[str] = []
+    REPLICA_LAG_TOLERANCE: float = 2.0
+    REPLICA_CHECK_INTERVAL: float = 5.0
     
     REDIS_PORT: str
     REDIS_HOST: str
@@ -42,6 +55,30 @@ class Settings(BaseSettings):
     REDIS_USERNAME: str
     REDIS_DB: str
     TEST_REDIS_DB: str
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_POOL_TIMEOUT: int = 5
+    REDIS_SOCKET_TIMEOUT: float = 5
+    REDIS_SOCKET_CONNECT_TIMEOUT: float = 5
+
+    HASH_WORKERS: int = 4
+    HASH_QUEUE_SIZE: int = 16
+
+    CACHE_TTL: int = 3600
+    CACHE_EARLY_REFRESH_BETA: float = 1.0
+    CACHE_REFRESH_LOCK_MS: int = 5000
+    LIST_CACHE_TTL: int = 300
+    LOCAL_CACHE_SIZE: int = 10000
+    LOCAL_CACHE_TTL: int = 30
+    LOCAL_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    BATCH_MAX_ITEMS: int = 10000
+    BATCH_CHUNK_SIZE: int = 1000
+    EXPORT_CHUNK_SIZE: int = 1000
+    IMPORT_CHUNK_SIZE: int = 5000
+    IMPORT_MAX_ERRORS: int = 1000
+    STATS_RECONCILE_CRON: str = "*/15 * * * *"
+
+    TOKEN_CACHE_SIZE: int = 10000
+    TOKEN_CACHE_TTL: int = 60
 
     @property
     def REDIS_URL(self):
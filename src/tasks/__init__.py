@@ -1,2 +1,3 @@
 from .mailing import send_verification_code_task, send_verification_link_task
-from .config import broker
\ No newline at end of file
+from .stats import reconcile_task_stats_task
+from .config import broker, scheduler
\ No newline at end of file
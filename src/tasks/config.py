@@ -1,12 +1,27 @@
+from taskiq import TaskiqEvents, TaskiqScheduler, TaskiqState
+from taskiq.schedule_sources import LabelScheduleSource
 from taskiq_redis import RedisAsyncResultBackend, RedisStreamBroker
 from src.settings import settings
+from src.utils.redis import init_redis, close_redis
 
 redis_backend = RedisAsyncResultBackend(
-    redis_url=settings.REDIS_URL
+    redis_url=settings.REDIS_URL,
+    max_connection_pool_size=settings.REDIS_MAX_CONNECTIONS,
 )
 
 broker = RedisStreamBroker(
-    url=settings.REDIS_URL
+    url=settings.REDIS_URL,
+    max_connection_pool_size=settings.REDIS_MAX_CONNECTIONS,
 ).with_result_backend(redis_backend)
 
+scheduler = TaskiqScheduler(broker, sources=[LabelScheduleSource(broker)])
 
+
+@broker.on_event(TaskiqEvents.WORKER_STARTUP)
+async def worker_startup(state: TaskiqState):
+    await init_redis()
+
+
+@broker.on_event(TaskiqEvents.WORKER_SHUTDOWN)
+async def worker_shutdown(state: TaskiqState):
+    await close_redis()
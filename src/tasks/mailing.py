@@ -1,6 +1,7 @@
 from src.mailing.verification import send_verification_link, send_verification_code
 from src.tasks.config import broker
 from src.settings import logger
+from src.utils.redis import get_redis
 
 
 @broker.task
@@ -9,6 +10,6 @@ async def send_verification_link_task(recepient: str, token: str):
     await send_verification_link(recepient, token)
 
 @broker.task
-async def send_verification_code_task(recepient: str, token: str):
+async def send_verification_code_task(recepient: str):
     logger.info(f"Send verification code to {recepient}")
-    await send_verification_code(recepient, token)
\ No newline at end of file
+    await send_verification_code(recepient, get_redis())
\ No newline at end of file
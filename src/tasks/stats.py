@@ -0,0 +1,24 @@
+from taskiq import TaskiqEvents, TaskiqState
+from src.tasks.config import broker
+from src.db.core import async_session_maker
+from src.settings import settings, logger
+from src.utils.redis import get_redis
+
+
+@broker.task(schedule=[{"cron": settings.STATS_RECONCILE_CRON}])
+async def reconcile_task_stats_task():
+    # репозиторий тянет за собой src.api, импорт внутри задачи не дает зациклиться при загрузке воркера
+    from src.repositories.task import TaskRepository
+
+    async with async_session_maker() as session:
+        scopes = await TaskRepository(session, get_redis()).reconcile_counters()
+    logger.info(f"Reconciled task counters for {scopes} scopes")
+
+
+@broker.on_event(TaskiqEvents.WORKER_STARTUP)
+async def reconcile_on_startup(state: TaskiqState):
+    """Счетчики могли пропасть вместе с Redis, пока воркер стоял: не ждем до ближайшего запуска по cron."""
+    try:
+        await reconcile_task_stats_task()
+    except Exception as e:
+        logger.error(f"Startup reconcile of task counters failed: {e}")
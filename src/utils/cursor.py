@@ -0,0 +1,36 @@
+from pydantic import TypeAdapter, ValidationError
+from functools import lru_cache
+import binascii
+import base64
+import json
+
+from src.exc.api import InvalidCursorException
+
+
+def encode_cursor(order_by: str, values: list) -> str:
+    """Упаковывает ключ последней строки страницы в непрозрачную строку."""
+    payload = json.dumps({"o": order_by, "v": values}, default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+@lru_cache
+def _adapter(type_: type) -> TypeAdapter:
+    return TypeAdapter(type_)
+
+
+def decode_cursor(cursor: str, order_by: str, types: list[type]) -> list:
+    """
+    Распаковывает курсор и приводит значения к типам ключей сортировки.
+    Курсор приходит от клиента, поэтому любое несовпадение числа или типа значений это 400, а не ошибка в базе.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = payload["v"]
+        if payload["o"] != order_by:
+            raise InvalidCursorException("Cursor does not match sort order")
+        if not isinstance(values, list) or len(values) != len(types):
+            raise InvalidCursorException()
+        return [_adapter(type_).validate_python(value) for type_, value in zip(types, values)]
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeDecodeError, ValidationError):
+        raise InvalidCursorException()
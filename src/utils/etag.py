@@ -0,0 +1,52 @@
+from fastapi import Response, status
+from pydantic import BaseModel
+import hashlib
+import re
+
+
+# entity-tag из RFC 9110: необязательный W/ и строка в кавычках, внутри которой может быть запятая
+ENTITY_TAG = re.compile(r'(W/)?("[^"]*")')
+
+
+def make_etag(version: int, projection: type[BaseModel] | None = None) -> str:
+    """
+    Сильный ETag по версии строки. У ответа с ?fields= другое представление, поэтому и тег свой:
+    короткий хэш отсортированного набора полей, одинаковый во всех воркерах.
+    """
+    if projection is None:
+        return f'"{version}"'
+    fields = hashlib.sha256(",".join(sorted(projection.model_fields)).encode()).hexdigest()[:12]
+    return f'"{version};{fields}"'
+
+
+def _entity_tags(header: str) -> list[tuple[bool, str]]:
+    """Теги из If-Match или If-None-Match: (слабый ли, тег в кавычках)."""
+    return [(bool(weak), tag) for weak, tag in ENTITY_TAG.findall(header)]
+
+
+def etag_matches(header: str | None, tag: str) -> bool:
+    """Слабое сравнение для If-None-Match: префикс W/ не учитывается."""
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    return any(candidate == tag for _, candidate in _entity_tags(header))
+
+
+def if_match_versions(header: str) -> list[int] | None:
+    """
+    Версии из If-Match для оптимистичной блокировки, None для "*" (подойдет любая существующая строка).
+    Слабые и чужие теги не подходят, для них список пуст и запись получит 412.
+    """
+    if header.strip() == "*":
+        return None
+    versions = []
+    for weak, candidate in _entity_tags(header):
+        version, _, _ = candidate.strip('"').partition(";")
+        if not weak and version.isdigit():
+            versions.append(int(version))
+    return versions
+
+
+def not_modified(tag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": tag})
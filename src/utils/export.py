@@ -0,0 +1,31 @@
+from pydantic import BaseModel
+from typing import AsyncIterator, Type
+import csv
+import io
+
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+async def to_ndjson(chunks: AsyncIterator[list[BaseModel]]) -> AsyncIterator[str]:
+    """Одна строка JSON на объект, одна запись в ответ на пачку."""
+    async for chunk in chunks:
+        yield "".join(model.model_dump_json() + "\n" for model in chunk)
+
+
+async def to_csv(chunks: AsyncIterator[list[BaseModel]], model: Type[BaseModel]) -> AsyncIterator[str]:
+    """CSV с заголовком из полей модели, буфер переиспользуется между пачками."""
+    fields = list(model.model_fields)
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    async for chunk in chunks:
+        writer.writerows(item.model_dump(mode="json") for item in chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
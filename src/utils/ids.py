@@ -0,0 +1,21 @@
+from uuid import UUID
+import os
+import time
+
+
+_last_timestamp = 0
+
+
+def uuid7() -> UUID:
+    """
+    UUID версии 7 (RFC 9562): 48 бит миллисекунд Unix, 12 бит долей миллисекунды и 62 случайных бита.
+    Ключи из одного процесса строго растут, поэтому вставки идут в правый край B-дерева, а не по всему индексу.
+    """
+    global _last_timestamp
+    ns = time.time_ns()
+    timestamp = (ns // 1_000_000) << 12 | (ns % 1_000_000) * 4096 // 1_000_000
+    # несколько ключей в одну долю миллисекунды или перевод часов назад
+    timestamp = max(timestamp, _last_timestamp + 1)
+    _last_timestamp = timestamp
+    rand = int.from_bytes(os.urandom(8), "big") & (1 << 62) - 1
+    return UUID(int=(timestamp >> 12) << 80 | 0x7 << 76 | (timestamp & 0xFFF) << 64 | 0b10 << 62 | rand)
@@ -0,0 +1,70 @@
+from typing import AsyncIterator, NamedTuple
+import csv
+
+
+class RowError(NamedTuple):
+    """Строка, которую не удалось даже разобрать: попадает в отчет импорта как 422."""
+
+    detail: str
+
+
+async def iter_lines(body: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """
+    Режет поток байтов на строки, держа в памяти только незаконченную строку.
+    Невалидные байты UTF-8 не роняют импорт: они становятся суррогатами, по которым строку отбрасывает разбор.
+    """
+    pending = b""
+    async for chunk in body:
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            yield line.decode(errors="surrogateescape").rstrip("\r")
+    if pending:
+        yield pending.decode(errors="surrogateescape").rstrip("\r")
+
+
+def _invalid_utf8(text: str) -> bool:
+    try:
+        text.encode()
+    except UnicodeEncodeError:
+        return True
+    return False
+
+
+async def ndjson_rows(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, str | RowError]]:
+    """Номер строки и сырой JSON, разбор вместе с валидацией делает модель."""
+    number = 0
+    async for line in lines:
+        number += 1
+        if _invalid_utf8(line):
+            yield number, RowError("Invalid UTF-8")
+        elif line.strip():
+            yield number, line
+
+
+async def csv_rows(lines: AsyncIterator[str]) -> AsyncIterator[tuple[int, dict | RowError]]:
+    """
+    Номер записи и словарь по заголовку. Запись заканчивается на переводе строки
+    только при четном числе кавычек, так что многострочные поля в кавычках не рвутся.
+    Пустые ячейки пропускаются, чтобы сработали значения по умолчанию.
+    """
+    header = None
+    number = 0
+    record = None
+    async for line in lines:
+        record = line if record is None else f"{record}\n{line}"
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record]), [])
+        invalid = _invalid_utf8(record)
+        record = None
+        if header is None:
+            header = values
+            continue
+        number += 1
+        if invalid:
+            yield number, RowError("Invalid UTF-8")
+        elif values:
+            yield number, {field: value for field, value in zip(header, values) if value != ""}
+    if record is not None:
+        yield number + 1, RowError("Unterminated quoted field")
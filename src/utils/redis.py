@@ -1,23 +1,66 @@
+from redis.asyncio import BlockingConnectionPool
 from redis.asyncio.client import Redis
-from datetime import timedelta
 
 from src.settings import settings, logger
 
 
+class MonitoredConnectionPool(BlockingConnectionPool):
+    """Блокирующий пул соединений, который считает ожидания свободного соединения."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+
+    async def get_connection(self, *args, **kwargs):
+        if not self.can_get_connection():
+            self.waits += 1
+        return await super().get_connection(*args, **kwargs)
+
+    def stats(self) -> dict:
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "waits": self.waits,
+        }
+
+
+redis_client: Redis | None = None
+
+
+def create_redis_client(db: str = settings.REDIS_DB) -> Redis:
+    pool = MonitoredConnectionPool(
+        max_connections=settings.REDIS_MAX_CONNECTIONS,
+        timeout=settings.REDIS_POOL_TIMEOUT,
+        username=settings.REDIS_USERNAME,
+        password=settings.REDIS_PASSWORD,
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        db=db,
+        socket_timeout=settings.REDIS_SOCKET_TIMEOUT,
+        socket_connect_timeout=settings.REDIS_SOCKET_CONNECT_TIMEOUT,
+        decode_responses=True,
+    )
+    return Redis.from_pool(pool)
+
+
+async def init_redis() -> Redis:
+    global redis_client
+    if redis_client is None:
+        redis_client = create_redis_client()
+        logger.info("Redis connection pool created")
+    return redis_client
+
+
+async def close_redis():
+    global redis_client
+    if redis_client is not None:
+        await redis_client.aclose()
+        redis_client = None
+        logger.info("Redis connection pool closed")
+
+
 def get_redis() -> Redis:
-    
-    try:
-        redis_conn = Redis(
-            username=settings.REDIS_USERNAME,
-            password=settings.REDIS_PASSWORD,            
-            host=settings.REDIS_HOST,
-            port=settings.REDIS_PORT,
-            db=settings.REDIS_DB,
-            decode_responses=True
-        ) 
-        logger.info(f'Successful connect to redis')
-        return redis_conn
-        
-    except Exception as e:
-        logger.error(f'Error with connect to redis: {e}')
-        raise
\ No newline at end of file
+    if redis_client is None:
+        raise RuntimeError("Redis connection pool is not initialized")
+    return redis_client
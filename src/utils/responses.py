@@ -0,0 +1,31 @@
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from functools import lru_cache
+from typing import Any, Mapping
+
+
+@lru_cache(maxsize=64)
+def _adapter(model: Any) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+class ModelResponse(Response):
+    """
+    JSON-ответ из уже провалидированных моделей или готовой строки JSON. pydantic-core сериализует модели напрямую:
+    FastAPI не прогоняет их второй раз через response_model и jsonable_encoder.
+    model сужает ответ до полей этого типа, например UserPublic для UserResponse, тоже без валидации.
+    """
+
+    media_type = "application/json"
+
+    def __init__(self, content: Any, status_code: int = 200, headers: Mapping[str, str] | None = None, model: Any = None):
+        self.model = model
+        super().__init__(content, status_code, headers)
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, (str, bytes)):
+            return super().render(content)
+        if self.model is not None:
+            return _adapter(self.model).dump_json(content)
+        return to_json(content)
@@ -4,6 +4,7 @@ from sqlalchemy import create_engine
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 from redis.asyncio.client import Redis
+from redis import Redis as SyncRedis
 from pathlib import Path
 import shutil
 import pytest_asyncio
@@ -12,7 +13,7 @@ import pytest
 import json
 import os
 
-from src.db import Base
+from src.db import Base, get_session_maker
 from src.api.endpoints.task import get_async_session, get_redis
 from src.settings.environment import settings, GLOBAL_PREFIX, BASE_DIR
 from src.api.endpoints.auth import send_verification_code_task, send_verification_link_task
@@ -31,6 +32,11 @@ async def override_get_db():
         yield session
 
 
+def override_get_session_maker():
+    engine_test = create_async_engine(settings.TEST_ASYNC_DATABASE_URL)
+    return async_sessionmaker(engine_test, class_=AsyncSession, expire_on_commit=False, autoflush=False)
+
+
 REDIS_DATA = {}
 async def override_get_redis():
     redis = Redis(
@@ -49,11 +55,20 @@ def test_db_session():
     engine = create_engine(settings.TEST_DATABASE_URL) 
     Base.metadata.drop_all(engine)
     engine.dispose()
+    with SyncRedis(
+            username=settings.REDIS_USERNAME,
+            password=settings.REDIS_PASSWORD,
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.TEST_REDIS_DB,
+    ) as redis:
+        redis.flushdb()
 
 
 @pytest.fixture()
 def test_client():
     app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_session_maker] = override_get_session_maker
     app.dependency_overrides[get_redis] = override_get_redis
     with TestClient(app) as c:
         yield c
@@ -68,6 +83,7 @@ def auth_client(test_user, test_client: TestClient):
     response = test_client.post(f"{GLOBAL_PREFIX}/auth/login", data=data)
     cookies = dict(response.cookies)
     app.dependency_overrides[get_async_session] = override_get_db
+    app.dependency_overrides[get_session_maker] = override_get_session_maker
     app.dependency_overrides[get_redis] = override_get_redis
     for k, v in cookies.items():
         test_client.cookies.set(k, v)
@@ -132,6 +148,10 @@ def use_direct_email_sending(monkeypatch):
     from src.tasks import mailing
     from src.mailing.verification import send_verification_link, send_verification_code
     
-    monkeypatch.setattr('src.api.endpoints.auth.send_verification_code_task.kiq', send_verification_code)
+    async def send_code_to_test_redis(recepient: str):
+        redis = await anext(override_get_redis())
+        await send_verification_code(recepient, redis)
+
+    monkeypatch.setattr('src.api.endpoints.auth.send_verification_code_task.kiq', send_code_to_test_redis)
     monkeypatch.setattr('src.api.endpoints.auth.send_verification_link_task.kiq', send_verification_link)
     yield
\ No newline at end of file
@@ -1,13 +1,57 @@
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives import serialization
 from fastapi.testclient import TestClient
 from uuid import uuid4
+import asyncio
+import signal
 import pytest
 import json
+import jwt
+import os
 
+from src.auth.keys import key_ring, key_id, install_reload_signal
 from src.settings import GLOBAL_PREFIX
+from src.settings.environment import AuthJWT
 from src.utils.enums import TokenName
 from tests.conftest import override_get_redis
 
 
+def write_key_pair(private_path, public_path):
+    """Новая пара RSA ключей в PEM, возвращает приватный ключ."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_path.write_bytes(private_key.private_bytes(
+        serialization.Encoding.PEM, serialization.PrivateFormat.PKCS8, serialization.NoEncryption(),
+    ))
+    public_path.write_bytes(private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo,
+    ))
+    return private_key
+
+
+@pytest.fixture()
+def rotating_keys(tmp_path, monkeypatch):
+    """Кольцо ключей на временном каталоге, файлы проверяются на каждом обращении."""
+    config = AuthJWT(
+        public_key=tmp_path / "public.pem",
+        private_key=tmp_path / "private.pem",
+        rotated_keys_dir=tmp_path / "rotated",
+        key_reload_interval=0,
+    )
+    config.rotated_keys_dir.mkdir()
+    write_key_pair(config.private_key, config.public_key)
+    monkeypatch.setattr(key_ring, "config", config)
+    for attribute in ("signing_kid", "signing_key", "public_keys", "_snapshot"):
+        monkeypatch.setattr(key_ring, attribute, None)
+    return config
+
+
+def rotate(config: AuthJWT) -> str:
+    """Ротация как на сервере: текущий публичный ключ уходит в rotated, на его место новая пара. Возвращает новый kid."""
+    previous = len(list(config.rotated_keys_dir.glob("*.pem")))
+    config.public_key.rename(config.rotated_keys_dir / f"{previous}.pem")
+    return key_id(write_key_pair(config.private_key, config.public_key).public_key())
+
+
 class TestAuthAPI:
     """Группа тестов для эндпоинтов /auth"""
 
@@ -35,6 +79,12 @@ class TestAuthAPI:
         assert response.status_code == 401
         assert "www-authenticate" in response.headers
 
+    def test_jwks(self, test_client: TestClient):
+        response = test_client.get(f"{self.BASE_URL}/jwks")
+        assert response.status_code == 200
+        keys = response.json()["keys"]
+        assert keys and all("kid" in key and key["kty"] == "RSA" for key in keys)
+
     def test_refresh_token(self, auth_client: TestClient, test_user):
         response = auth_client.post(f"{self.BASE_URL}/refresh")
         assert response.status_code == 200
@@ -42,6 +92,14 @@ class TestAuthAPI:
         assert TokenName.ACCESS_TOKEN in response.cookies
 
     
+    def test_current_user_sees_update(self, auth_client: TestClient, test_user):
+        response = auth_client.post(f"{self.BASE_URL}/verif-email")
+        assert response.json() == {"message": "send link to email"}
+
+        auth_client.put(f"{GLOBAL_PREFIX}/users/{test_user["id"]}", json={"is_verified": True})
+        response = auth_client.post(f"{self.BASE_URL}/verif-email")
+        assert response.json() == {"message": "Confirmation email already completed"}
+
     async def test_2fa(self, test_client: TestClient, test_user):
         data = {"is_verified": True}
         update_response = test_client.put(f"{GLOBAL_PREFIX}/users/{test_user["id"]}", json=data)
@@ -58,4 +116,49 @@ class TestAuthAPI:
         assert TokenName.REFRESH_TOKEN in content
 
 
+class TestKeyRotation:
+    """Группа тестов для ротации ключей подписи JWT"""
+
+    BASE_URL = f"{GLOBAL_PREFIX}/auth"
+
+    def login(self, client: TestClient) -> str:
+        response = client.post(f"{self.BASE_URL}/login", data=TestAuthAPI.CREDENTIALS)
+        return response.json()[TokenName.ACCESS_TOKEN]
+
+    def test_previous_kid_still_verifies(self, rotating_keys, test_client: TestClient, test_user):
+        """Тест что токен, подписанный до ротации, принимается, а новые подписываются новым ключом."""
+        old_token = self.login(test_client)
+        old_kid = jwt.get_unverified_header(old_token)["kid"]
+        new_kid = rotate(rotating_keys)
+
+        response = test_client.get(f"{GLOBAL_PREFIX}/tasks/my", headers={"Authorization": f"Bearer {old_token}"})
+        assert response.status_code == 200
+        assert jwt.get_unverified_header(self.login(test_client))["kid"] == new_kid
+        kids = {key["kid"] for key in test_client.get(f"{self.BASE_URL}/jwks").json()["keys"]}
+        assert kids == {old_kid, new_kid}
+
+    def test_unknown_kid_rejected(self, rotating_keys, test_client: TestClient, test_user, tmp_path):
+        """Тест что токен с неизвестным kid дает 401, даже если он подписан корректно своим ключом."""
+        foreign = write_key_pair(tmp_path / "foreign.pem", tmp_path / "foreign.pub.pem")
+        payload = jwt.decode(self.login(test_client), options={"verify_signature": False})
+        token = jwt.encode(payload, foreign, algorithm="RS256", headers={"kid": key_id(foreign.public_key())})
+
+        response = test_client.get(f"{GLOBAL_PREFIX}/tasks/my", headers={"Authorization": f"Bearer {token}"})
+        assert response.status_code == 401
+
+    @pytest.mark.asyncio
+    async def test_sighup_reloads_keys(self, rotating_keys):
+        """Тест что SIGHUP перечитывает ключи, не дожидаясь проверки mtime."""
+        rotating_keys.key_reload_interval = 3600
+        old_kid, _ = key_ring.signing()
+        new_kid = rotate(rotating_keys)
+        assert key_ring.signing()[0] == old_kid
 
+        install_reload_signal()
+        try:
+            os.kill(os.getpid(), signal.SIGHUP)
+            await asyncio.sleep(0.1)
+        finally:
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGHUP)
+        assert key_ring.signing()[0] == new_kid
+        assert old_kid in key_ring.public_keys
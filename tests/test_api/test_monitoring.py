@@ -0,0 +1,37 @@
+from fastapi.testclient import TestClient
+
+from src.settings import GLOBAL_PREFIX
+
+
+class TestMonitoringAPI:
+    """Группа тестов для эндпоинтов /monitoring"""
+
+    BASE_URL = f"{GLOBAL_PREFIX}/monitoring"
+
+    def test_redis_pool_stats(self, test_client: TestClient):
+        """Тест получения статистики пула соединений Redis."""
+        response = test_client.get(f"{self.BASE_URL}/redis")
+        assert response.status_code == 200
+        stats = response.json()
+        for key in ("max_connections", "in_use", "idle", "waits"):
+            assert key in stats
+
+    def test_cache_stats(self, test_client: TestClient, test_task: dict):
+        """Тест счетчиков кэша: повторное чтение задачи попадает в L1."""
+        test_client.get(f"{GLOBAL_PREFIX}/tasks/{test_task["id"]}")
+        test_client.get(f"{GLOBAL_PREFIX}/tasks/{test_task["id"]}")
+
+        response = test_client.get(f"{self.BASE_URL}/cache")
+        assert response.status_code == 200
+        stats = response.json()
+        assert {"token", "l1", "l2"} <= stats.keys()
+        assert stats["l1"]["hits"] >= 1
+
+    def test_db_stats(self, test_client: TestClient):
+        """Тест статистики пула PostgreSQL: без настроенных реплик все чтения идут в мастер."""
+        response = test_client.get(f"{self.BASE_URL}/db")
+        assert response.status_code == 200
+        stats = response.json()
+        for key in ("pool_size", "checked_out", "overflow", "timeouts", "wait_histogram"):
+            assert key in stats["primary"]
+        assert stats["replicas"] == []
@@ -1,9 +1,11 @@
 from fastapi.testclient import TestClient
-from uuid import uuid4
+from redis import Redis as SyncRedis
+from uuid import UUID, uuid4
 import pytest
 import json
 
-from src.settings import GLOBAL_PREFIX
+from src.settings import GLOBAL_PREFIX, settings
+from src.utils.cursor import encode_cursor
 
 
 class TestTaskAPI:
@@ -44,6 +46,49 @@ class TestTaskAPI:
         assert get_task_json["id"] == test_task["id"]
         assert get_task_json["name"] == test_task["name"]
 
+    def test_task_etag(self, test_client: TestClient, test_task: dict):
+        """Тест ETag: 304 для актуальной версии и 412 при обновлении устаревшей."""
+        task_url = f"{self.BASE_URL}{test_task["id"]}"
+        tag = test_client.get(task_url).headers["ETag"]
+        assert tag == '"1"'
+
+        response = test_client.get(task_url, headers={"If-None-Match": tag})
+        assert response.status_code == 304 and response.content == b""
+
+        response = test_client.put(task_url, json={"name": "Renamed"}, headers={"If-Match": tag})
+        assert response.status_code == 200
+        assert response.headers["ETag"] == '"2"'
+
+        response = test_client.put(task_url, json={"name": "Lost update"}, headers={"If-Match": tag})
+        assert response.status_code == 412
+        response = test_client.get(task_url, headers={"If-None-Match": tag})
+        assert response.status_code == 200 and response.json()["name"] == "Renamed"
+
+        response = test_client.put(f"{self.BASE_URL}{uuid4()}", json={"name": "Missing"}, headers={"If-Match": tag})
+        assert response.status_code == 404
+
+    def test_task_etag_with_fields(self, test_client: TestClient, test_task: dict):
+        """Тест ETag ответа с fields: свой тег, 304 на него и не 304 на тег полного ответа."""
+        task_url = f"{self.BASE_URL}{test_task["id"]}"
+        full_tag = test_client.get(task_url).headers["ETag"]
+        tag = test_client.get(task_url, params={"fields": "status,name"}).headers["ETag"]
+        assert tag != full_tag
+        assert test_client.get(task_url, params={"fields": "name,status"}).headers["ETag"] == tag
+
+        response = test_client.get(task_url, params={"fields": "status,name"}, headers={"If-None-Match": tag})
+        assert response.status_code == 304
+        response = test_client.get(task_url, params={"fields": "status,name"}, headers={"If-None-Match": full_tag})
+        assert response.status_code == 200
+
+    def test_task_ids_follow_creation_order(self, test_client: TestClient, test_user: dict):
+        """Тест что id новых задач это UUIDv7 и курсор по id идет в порядке создания."""
+        names = [f"Task {i}" for i in range(5)]
+        ids = [test_client.post(self.BASE_URL, json={"name": name, "owner_id": test_user["id"]}).json()["id"] for name in names]
+        assert all(UUID(id).version == 7 for id in ids)
+
+        page = test_client.get(self.BASE_URL, params={"cursor": "", "limit": 10}).json()
+        assert [task["name"] for task in page["items"]] == names
+
     def test_get_tasks_empty_list(self, test_client: TestClient):
         """Тест получения пустого списка задач."""
         response = test_client.get(self.BASE_URL)
@@ -78,6 +123,184 @@ class TestTaskAPI:
         assert len(skip_data) == 2
         assert skip_data[0]["name"] == "Task C"
 
+    def test_get_tasks_fields(self, test_client: TestClient, test_task: dict):
+        """Тест выбора полей: списки по умолчанию без описания, fields задает поля явно."""
+        task = test_client.get(self.BASE_URL).json()[0]
+        assert set(task) == {"id", "name", "status", "owner_id"}
+
+        response = test_client.get(self.BASE_URL, params={"fields": "name,description"})
+        assert response.json() == [{"id": test_task["id"], "name": test_task["name"], "description": test_task["description"]}]
+
+        response = test_client.get(f"{self.BASE_URL}{test_task["id"]}", params={"fields": "status"})
+        assert response.json() == {"id": test_task["id"], "status": test_task["status"]}
+
+        assert test_client.get(self.BASE_URL, params={"fields": "name,secret"}).status_code == 400
+
+    def test_get_tasks_list_after_create(self, test_client: TestClient, test_user: dict):
+        """Тест что закэшированный список сбрасывается после создания задачи."""
+        assert test_client.get(self.BASE_URL).json() == []
+
+        test_client.post(self.BASE_URL, json={"name": "New Task", "owner_id": test_user["id"]})
+        response = test_client.get(self.BASE_URL)
+        assert [task["name"] for task in response.json()] == ["New Task"]
+
+    def test_get_tasks_cursor_pagination(self, test_client: TestClient, test_user: dict):
+        """Тест курсорной пагинации: обход всех страниц без повторов и пропусков."""
+        names = {f"Task {i}" for i in range(5)}
+        for name in names:
+            test_client.post(self.BASE_URL, json={"name": name, "owner_id": test_user["id"]})
+
+        seen = []
+        params = {"cursor": "", "limit": 2, "order_by": "name"}
+        while True:
+            response = test_client.get(self.BASE_URL, params=params)
+            assert response.status_code == 200
+            page = response.json()
+            seen.extend(task["name"] for task in page["items"])
+            if page["next_cursor"] is None:
+                break
+            params["cursor"] = page["next_cursor"]
+
+        assert seen == sorted(names)
+
+    def test_get_tasks_invalid_cursor(self, test_client: TestClient):
+        """Тест ошибки при передаче испорченного курсора или курсора с чужими значениями."""
+        response = test_client.get(self.BASE_URL, params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
+        for order_by, values in (("id", [1]), ("id", [str(uuid4()), str(uuid4())]), ("name", [5, str(uuid4())])):
+            cursor = encode_cursor(order_by, values)
+            response = test_client.get(self.BASE_URL, params={"cursor": cursor, "order_by": order_by})
+            assert response.status_code == 400
+
+    def test_export_tasks(self, test_client: TestClient, test_user: dict):
+        """Тест потоковой выгрузки задач в NDJSON и CSV с фильтром по статусу."""
+        test_client.post(self.BASE_URL, json={"name": "Task A", "owner_id": test_user["id"]})
+        test_client.post(self.BASE_URL, json={"name": "Task B", "status": "в работе", "owner_id": test_user["id"]})
+
+        response = test_client.get(f"{self.BASE_URL}export")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert sorted(row["name"] for row in rows) == ["Task A", "Task B"]
+
+        response = test_client.get(f"{self.BASE_URL}export", params={"format": "csv", "status": "в работе"})
+        assert response.status_code == 200
+        lines = response.text.splitlines()
+        assert lines[0].split(",")[0] == "name"
+        assert len(lines) == 2 and lines[1].startswith("Task B,")
+
+    def test_import_tasks(self, test_client: TestClient, test_user: dict):
+        """Тест загрузки задач потоком с отчетом об ошибках по строкам."""
+        owner = test_user["id"]
+        body = "\n".join([
+            json.dumps({"name": "Imported A", "owner_id": owner}),
+            json.dumps({"name": "", "owner_id": owner}),
+            "not json",
+            json.dumps({"name": "Orphan", "owner_id": str(uuid4())}),
+            json.dumps({"name": "Imported B", "status": "в работе", "owner_id": owner}),
+        ])
+        response = test_client.post(f"{self.BASE_URL}import", content=body)
+        assert response.status_code == 200
+        report = response.json()
+        assert report["imported"] == 2
+        assert [(error["row"], error["status"]) for error in report["errors"]] == [(2, 422), (3, 422), (4, 404)]
+
+        csv_body = f'name,description,owner_id\r\n"Multi\nline",,{owner}\r\n'
+        response = test_client.post(f"{self.BASE_URL}import", params={"format": "csv"}, content=csv_body)
+        assert response.json()["imported"] == 1
+
+        names = sorted(task["name"] for task in test_client.get(self.BASE_URL).json())
+        assert names == ["Imported A", "Imported B", "Multi\nline"]
+
+    def test_import_tasks_broken_rows(self, test_client: TestClient, test_user: dict):
+        """Тест что невалидный UTF-8 и незакрытая кавычка это ошибки строк, а не отказ всего импорта."""
+        owner = test_user["id"]
+        body = b"\n".join([
+            json.dumps({"name": "Valid", "owner_id": owner}).encode(),
+            b'{"name": "\xff\xfe", "owner_id": "' + owner.encode() + b'"}',
+        ])
+        response = test_client.post(f"{self.BASE_URL}import", content=body)
+        assert response.status_code == 200
+        report = response.json()
+        assert report["imported"] == 1
+        assert [(error["row"], error["status"]) for error in report["errors"]] == [(2, 422)]
+
+        csv_body = f'name,owner_id\r\nClosed,{owner}\r\n"Never closed,{owner}\r\n'
+        response = test_client.post(f"{self.BASE_URL}import", params={"format": "csv"}, content=csv_body)
+        report = response.json()
+        assert report["imported"] == 1
+        assert [(error["row"], error["status"]) for error in report["errors"]] == [(2, 422)]
+
+    def test_task_stats(self, auth_client: TestClient, test_user: dict):
+        """Тест счетчиков задач по статусам после создания, обновления и удаления."""
+        first = auth_client.post(self.BASE_URL, json={"name": "Task A", "owner_id": test_user["id"]}).json()
+        second = auth_client.post(self.BASE_URL, json={"name": "Task B", "owner_id": test_user["id"]}).json()
+        auth_client.put(f"{self.BASE_URL}{first["id"]}", json={"status": "в работе"})
+        auth_client.delete(f"{self.BASE_URL}{second["id"]}")
+
+        response = auth_client.get(f"{self.BASE_URL}stats")
+        assert response.status_code == 200
+        assert response.json() == {"total": 1, "by_status": {"создано": 0, "в работе": 1, "завершено": 0}}
+
+        assert auth_client.get(f"{self.BASE_URL}stats/global").status_code == 403
+
+    def test_task_stats_after_redis_flush(self, auth_client: TestClient, test_user: dict):
+        """Тест что пропавшие из Redis счетчики пересчитываются из базы, а не читаются как нули."""
+        auth_client.post(self.BASE_URL, json={"name": "Task A", "owner_id": test_user["id"]})
+        auth_client.post(self.BASE_URL, json={"name": "Task B", "status": "в работе", "owner_id": test_user["id"]})
+        with SyncRedis(
+                username=settings.REDIS_USERNAME,
+                password=settings.REDIS_PASSWORD,
+                host=settings.REDIS_HOST,
+                port=settings.REDIS_PORT,
+                db=settings.TEST_REDIS_DB,
+        ) as redis:
+            redis.delete(*redis.keys("Task_counters*"))
+        auth_client.post(self.BASE_URL, json={"name": "Task C", "owner_id": test_user["id"]})
+
+        response = auth_client.get(f"{self.BASE_URL}stats")
+        assert response.json() == {"total": 3, "by_status": {"создано": 2, "в работе": 1, "завершено": 0}}
+
+    def test_tasks_total_count(self, test_client: TestClient, test_user: dict):
+        """Тест заголовка X-Total-Count в точном и примерном режимах."""
+        test_client.post(self.BASE_URL, json={"name": "Task A", "owner_id": test_user["id"]})
+        test_client.post(self.BASE_URL, json={"name": "Task B", "status": "в работе", "owner_id": test_user["id"]})
+
+        assert "X-Total-Count" not in test_client.get(self.BASE_URL).headers
+        assert test_client.get(self.BASE_URL, params={"total": "exact"}).headers["X-Total-Count"] == "2"
+        response = test_client.get(self.BASE_URL, params={"total": "exact", "status": "в работе"})
+        assert response.headers["X-Total-Count"] == "1"
+
+        test_client.post(self.BASE_URL, json={"name": "Task C", "owner_id": test_user["id"]})
+        assert test_client.get(self.BASE_URL, params={"total": "exact"}).headers["X-Total-Count"] == "3"
+
+        # таблицу не анализировали: оценка берется из EXPLAIN, а не из пустой статистики
+        response = test_client.get(self.BASE_URL, params={"total": "estimated"})
+        assert response.status_code == 200
+        assert int(response.headers["X-Total-Count"]) > 0
+
+    def test_search_tasks(self, test_client: TestClient, test_user: dict):
+        """Тест полнотекстового поиска: префиксы, ранжирование, фильтры и курсор."""
+        owner = test_user["id"]
+        test_client.post(self.BASE_URL, json={"name": "Купить молоко", "owner_id": owner})
+        test_client.post(self.BASE_URL, json={"name": "Магазин", "description": "молоко и хлеб", "owner_id": owner})
+        test_client.post(self.BASE_URL, json={"name": "Починить кран", "status": "в работе", "owner_id": owner})
+
+        response = test_client.get(f"{self.BASE_URL}search", params={"q": "мол"})
+        assert response.status_code == 200
+        assert [task["name"] for task in response.json()["items"]] == ["Купить молоко", "Магазин"]
+
+        response = test_client.get(f"{self.BASE_URL}search", params={"q": "мол", "limit": 1})
+        page = response.json()
+        assert [task["name"] for task in page["items"]] == ["Купить молоко"]
+        response = test_client.get(f"{self.BASE_URL}search", params={"q": "мол", "limit": 1, "cursor": page["next_cursor"]})
+        assert [task["name"] for task in response.json()["items"]] == ["Магазин"]
+        assert response.json()["next_cursor"] is None
+
+        response = test_client.get(f"{self.BASE_URL}search", params={"q": "кран", "status": "создано"})
+        assert response.json()["items"] == []
+
     def test_update_task_success(self, test_client: TestClient, test_task: dict):
         """Тест успешного обновления задачи."""
         task_id = test_task["id"]
@@ -91,6 +314,14 @@ class TestTaskAPI:
         assert updated_task["name"] == update_data["name"]
         assert updated_task["status"] == update_data["status"]
 
+    def test_get_task_after_update(self, test_client: TestClient, test_task: dict):
+        """Тест что после обновления чтение не отдает устаревшую задачу из кэша."""
+        task_url = f"{self.BASE_URL}{test_task["id"]}"
+        assert test_client.get(task_url).json()["name"] == test_task["name"]
+
+        test_client.put(task_url, json={"name": "Fresh Name"})
+        assert test_client.get(task_url).json()["name"] == "Fresh Name"
+
     def test_update_task_not_found(self, test_client: TestClient):
         """Тест обновления несуществующей задачи."""
         random_uuid = uuid4()
@@ -98,6 +329,46 @@ class TestTaskAPI:
         response = test_client.put(f"{self.BASE_URL}{random_uuid}", json=update_data)
         assert response.status_code == 404
 
+    def test_batch_create_update_delete(self, test_client: TestClient, test_user: dict):
+        """Тест пачечных эндпоинтов с результатом по каждому элементу."""
+        batch_url = f"{self.BASE_URL}batch"
+        tasks = [{"name": f"Batch {i}", "owner_id": test_user["id"]} for i in range(3)]
+        tasks.append({"name": "Orphan", "owner_id": str(uuid4())})
+
+        created = test_client.post(batch_url, json=tasks).json()
+        assert [item["status"] for item in created] == [201, 201, 201, 404]
+        ids = [item["item"]["id"] for item in created[:3]]
+
+        updates = [{"id": ids[0], "status": "завершено"}, {"id": str(uuid4()), "name": "Missing"}]
+        updated = test_client.patch(batch_url, json=updates).json()
+        assert [item["status"] for item in updated] == [200, 404]
+        assert updated[0]["item"]["status"] == "завершено"
+
+        deleted = test_client.request("DELETE", batch_url, json=ids).json()
+        assert [item["status"] for item in deleted] == [200, 200, 200]
+        assert test_client.get(self.BASE_URL).json() == []
+
+    def test_batch_update_rejects_duplicates_and_nulls(self, test_client: TestClient, test_task: dict):
+        """Тест что повтор id и null в обязательном поле это ошибки отдельных элементов пачки."""
+        batch_url = f"{self.BASE_URL}batch"
+        updates = [
+            {"id": test_task["id"], "name": "First"},
+            {"id": test_task["id"], "name": "Second"},
+            {"id": test_task["id"], "status": "в работе"},
+        ]
+        updated = test_client.patch(batch_url, json=updates).json()
+        assert [item["status"] for item in updated] == [200, 422, 422]
+        assert updated[1]["detail"] == "Duplicate id in batch"
+        task = test_client.get(f"{self.BASE_URL}{test_task["id"]}").json()
+        assert task["name"] == "First" and task["status"] == test_task["status"]
+        assert task["version"] == test_task["version"] + 1
+
+        updated = test_client.patch(batch_url, json=[{"id": test_task["id"], "name": None}]).json()
+        assert updated[0]["status"] == 422
+        updated = test_client.patch(batch_url, json=[{"id": test_task["id"], "owner_id": None, "description": None}]).json()
+        assert updated[0]["status"] == 422
+        assert test_client.get(f"{self.BASE_URL}{test_task["id"]}").json()["name"] == "First"
+
     def test_delete_task_success(self, test_client: TestClient, test_task: dict):
         """Тест успешного удаления задачи."""
         task_id = test_task["id"]
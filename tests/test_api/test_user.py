@@ -26,7 +26,7 @@ class TestUserAPI:
         response_json = response.json()
         assert response_json["name"] == data["name"]
         assert response_json["surname"] == data["surname"]
-        assert "id" in response_json and "role" in response_json and "hashed_password" in response_json
+        assert "id" in response_json and "role" in response_json and "hashed_password" not in response_json
         assert response_json["role"] == "Пользователь"
 
     def test_create_user_not_uinique_email(self, test_client: TestClient, test_user: dict):
@@ -70,6 +70,19 @@ class TestUserAPI:
         assert get_user_json["id"] == test_user["id"]
         assert get_user_json["name"] == test_user["name"]
 
+    def test_get_users_without_password(self, test_client: TestClient, test_user: dict):
+        """Тест что ни чтение, ни запись пользователя не отдают хэш пароля, а fields выбирает поля."""
+        user_url = f"{self.BASE_URL}{test_user["id"]}"
+        assert "hashed_password" not in test_user
+        assert "hashed_password" not in test_client.get(self.BASE_URL).json()[0]
+        assert "hashed_password" not in test_client.get(user_url).json()
+        assert "hashed_password" not in test_client.put(user_url, json={"surname": "Hidden"}).json()
+        assert "hashed_password" not in test_client.delete(user_url).json()
+
+        response = test_client.get(self.BASE_URL, params={"fields": "name"})
+        assert response.json() == [{"id": test_user["id"], "name": test_user["name"]}]
+        assert test_client.get(self.BASE_URL, params={"fields": "hashed_password"}).status_code == 400
+
     def test_get_users_empty_list(self, test_client: TestClient):
         """Тест получения пустого списка пользователей."""
         response = test_client.get(self.BASE_URL)
@@ -89,6 +102,14 @@ class TestUserAPI:
         assert updated_user["name"] == update_data["name"]
         assert updated_user["role"] == update_data["role"]
 
+    def test_get_user_after_update(self, test_client: TestClient, test_user: dict):
+        """Тест что после обновления чтение не отдает устаревшего пользователя из кэша."""
+        user_url = f"{self.BASE_URL}{test_user["id"]}"
+        assert test_client.get(user_url).json()["surname"] == test_user["surname"]
+
+        test_client.put(user_url, json={"surname": "Fresh"})
+        assert test_client.get(user_url).json()["surname"] == "Fresh"
+
     def test_update_user_not_found(self, test_client: TestClient):
         """Тест обновления несуществующего пользователя."""
         random_uuid = uuid4()
@@ -0,0 +1,66 @@
+from uuid import uuid4
+import time
+import pytest
+
+from src.api.models.task import TaskResponse
+from src.cache import CacheEntry, object_cache
+from src.repositories.task import TaskRepository
+from src.settings.environment import settings
+from src.utils.enums import TaskStatusEnum
+from tests.conftest import override_get_redis
+
+
+class TestCacheEntry:
+    """Группа тестов для записи кэша и раннего обновления (XFetch)"""
+
+    def test_pack_unpack(self):
+        """Тест упаковки записи и отказа от записи чужого поколения."""
+        entry = CacheEntry("3", 100.5, 0.25, '{"name":"a:b"}')
+        assert CacheEntry.unpack(entry.pack(), "3") == entry
+        assert CacheEntry.unpack(entry.pack(), "4") is None
+        assert CacheEntry.unpack("garbage", "3") is None
+
+    def test_should_refresh(self, monkeypatch):
+        """Тест XFetch: далеко до истечения не обновляем, истекшую обновляем, у самого истечения обновляем заранее."""
+        now = time.time()
+        assert not CacheEntry("0", now + 3600, 0.01, "{}").should_refresh(1.0)
+        assert CacheEntry("0", now - 1, 0.01, "{}").should_refresh(1.0)
+        assert not CacheEntry("0", now - 1, 0.01, "{}").should_refresh(0)
+        assert not CacheEntry("0", now - 1, 0, "{}").should_refresh(1.0)
+
+        monkeypatch.setattr("src.cache.entry.random.random", lambda: 0.999)
+        assert CacheEntry("0", now + 1, 1.0, "{}").should_refresh(1.0)
+
+
+class TestEarlyRefresh:
+    """Группа тестов для раннего обновления в репозитории: пересобирает ключ только владелец блокировки"""
+
+    @pytest.mark.asyncio
+    async def test_refresh_takes_lock(self):
+        """Тест что запись на грани истечения пересобирается, а при занятой блокировке отдается из кэша."""
+        redis = await anext(override_get_redis())
+        task = TaskResponse(id=uuid4(), name="cached", owner_id=uuid4(), status=TaskStatusEnum.CREATED, version=1)
+        loads = 0
+
+        class Repository(TaskRepository):
+            async def _get(self, id):
+                nonlocal loads
+                loads += 1
+                return task.model_copy(update={"name": "fresh"})
+
+        repo = Repository(None, redis)
+        key = repo._key(task.id)
+        stale = CacheEntry("0", time.time() - 1, 0.5, task.model_dump_json()).pack()
+
+        await redis.set(key, stale)
+        await redis.set(f"{key}_refresh", "1", px=settings.CACHE_REFRESH_LOCK_MS)
+        object_cache.local.clear()
+        assert (await repo.get(task.id)).name == "cached"
+        assert loads == 0
+
+        await redis.delete(f"{key}_refresh")
+        object_cache.local.clear()
+        assert (await repo.get(task.id)).name == "fresh"
+        assert loads == 1
+        assert await redis.exists(f"{key}_refresh")
+        await redis.aclose()
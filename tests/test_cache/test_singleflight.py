@@ -0,0 +1,77 @@
+import asyncio
+import pytest
+
+from src.cache import SingleFlight
+
+
+class TestSingleFlight:
+    """Группа тестов для SingleFlight"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_misses_load_once(self):
+        """Тест что одновременные промахи по одному ключу делают одну загрузку и получают ее результат."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return "value"
+
+        waiters = [asyncio.create_task(flight.do("key", load)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        assert await asyncio.gather(*waiters) == ["value"] * 10
+        assert calls == 1
+        assert flight.stats() == {"in_flight": 0, "coalesced": 9}
+
+    @pytest.mark.asyncio
+    async def test_error_reaches_every_waiter(self):
+        """Тест что ошибку загрузки получают все ожидающие, а следующий вызов грузит заново."""
+        flight = SingleFlight()
+        release = asyncio.Event()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            raise ValueError("db is down")
+
+        waiters = [asyncio.create_task(flight.do("key", load)) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, ValueError) for result in results)
+        assert calls == 1
+
+        with pytest.raises(ValueError):
+            await flight.do("key", load)
+        assert calls == 2
+
+    @pytest.mark.asyncio
+    async def test_cancelled_leader_waiter_retries(self):
+        """Тест что при отмене того, кто грузит, ожидающий не отменяется, а грузит сам."""
+        flight = SingleFlight()
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            if calls == 1:
+                await asyncio.Event().wait()
+            return "value"
+
+        leader = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flight.do("key", load))
+        await asyncio.sleep(0)
+        leader.cancel()
+
+        assert await waiter == "value"
+        assert calls == 2
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        assert flight.stats()["in_flight"] == 0
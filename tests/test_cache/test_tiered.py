@@ -0,0 +1,36 @@
+from pydantic import BaseModel
+from uuid import UUID, uuid4
+import asyncio
+import time
+import pytest
+
+from src.auth.cache import token_cache
+from src.cache import TieredCache
+from tests.conftest import override_get_redis
+
+
+class CachedUser(BaseModel):
+    id: UUID
+
+
+class TestTieredCache:
+    """Группа тестов для оповещений об изменениях между воркерами"""
+
+    @pytest.mark.asyncio
+    async def test_reconnect_clears_token_cache(self):
+        """Тест что после переподключения к каналу кэш токенов сбрасывается: оповещения за обрыв потеряны."""
+        redis = await anext(override_get_redis())
+        cache = TieredCache(100, 60, 10 ** 6)
+        cache.on_change("User", token_cache.invalidate_user)
+        cache.start(redis)
+        try:
+            await asyncio.sleep(0.5)
+            token_cache.set("token", {"exp": time.time() + 60}, CachedUser(id=uuid4()))
+            assert token_cache.get("token") is not None
+
+            await redis.client_kill_filter(_type="pubsub")
+            await asyncio.sleep(2)
+            assert token_cache.get("token") is None
+        finally:
+            await cache.stop()
+            await redis.aclose()
@@ -0,0 +1,132 @@
+from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
+from sqlalchemy import create_engine, event, select, text
+import pytest
+import json
+
+from src.db import Base, Task, User
+from src.repositories.task import TaskRepository
+from src.repositories.user import UserRepository
+from src.settings.environment import settings
+from src.utils.enums import TaskStatusEnum
+
+
+SEED_USERS = 1000
+SEED_TASKS = 20000
+
+# Каждая форма запроса вызывает настоящий метод репозитория, планы строятся по тому SQL, который он отправил.
+# Нефильтрованная страница get_list без ORDER BY не проверяется: там полный проход с LIMIT и есть лучший план.
+QUERY_SHAPES = {
+    "get_by_id": lambda tasks, users, owner, task: users._get(owner),
+    "task_by_id": lambda tasks, users, owner, task: tasks._get(task),
+    "task_list_by_status": lambda tasks, users, owner, task: tasks.get_list(0, 50, status=TaskStatusEnum.IN_WORK),
+    "task_page": lambda tasks, users, owner, task: tasks.get_page(50, None, "id"),
+    "task_page_by_name": lambda tasks, users, owner, task: tasks.get_page(50, None, "name"),
+    "task_page_by_status": lambda tasks, users, owner, task: tasks.get_page(50, None, "id", status=TaskStatusEnum.IN_WORK),
+    "owner_tasks": lambda tasks, users, owner, task: tasks.get_page(50, None, "id", owner_id=owner),
+    "owner_tasks_by_status": lambda tasks, users, owner, task: tasks.get_list(0, 50, owner_id=owner, status=TaskStatusEnum.IN_WORK),
+    "owners_exist": lambda tasks, users, owner, task: tasks._batch_errors([{"owner_id": owner}]),
+    "task_search": lambda tasks, users, owner, task: tasks.search("task42", 50, None),
+    "user_by_username": lambda tasks, users, owner, task: users.get_by_username("user42"),
+    "user_page_by_email": lambda tasks, users, owner, task: users.get_page(50, None, "email"),
+}
+
+
+@pytest.fixture
+def seeded_db():
+    engine = create_engine(settings.TEST_DATABASE_URL)
+    Base.metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "INSERT INTO users (id, name, surname, email, hashed_password, birthdate, is_active, is_verified, role) "
+                "SELECT gen_random_uuid(), 'user' || i, 'Test', 'user' || i || '@example.com', 'x', '2000-01-01', "
+                "true, true, 'USER' FROM generate_series(1, :users) i"
+            ),
+            {"users": SEED_USERS},
+        )
+        conn.execute(
+            text(
+                "INSERT INTO tasks (id, name, status, owner_id) "
+                "SELECT gen_random_uuid(), 'task' || i, "
+                "(ARRAY['CREATED', 'IN_WORK', 'COMLETED']::taskstatusenum[])[1 + i % 3], owners.ids[1 + i % :users] "
+                "FROM generate_series(1, :tasks) i, (SELECT array_agg(id) AS ids FROM users) owners"
+            ),
+            {"users": SEED_USERS, "tasks": SEED_TASKS},
+        )
+        conn.execute(text("ANALYZE users"))
+        conn.execute(text("ANALYZE tasks"))
+    engine.dispose()
+    yield
+
+
+def full_scans(node: dict):
+    """Узлы плана, которые читают таблицу целиком: Seq Scan или проход индекса без условия, только с фильтром."""
+    if node["Node Type"] == "Seq Scan":
+        yield f"Seq Scan on {node['Relation Name']}"
+    elif "Scan" in node["Node Type"] and "Filter" in node and "Index Cond" not in node:
+        yield f"{node['Node Type']} on {node['Relation Name']} without Index Cond"
+    for child in node.get("Plans", []):
+        yield from full_scans(child)
+
+
+def relations(node: dict):
+    if "Relation Name" in node:
+        yield node["Relation Name"]
+    for child in node.get("Plans", []):
+        yield from relations(child)
+
+
+async def shape_plans(shape: str, *settings_sql: str) -> list[tuple[str, dict]]:
+    """Выполняет форму запроса и возвращает планы всех выражений, которые она отправила в базу."""
+    engine = create_async_engine(settings.TEST_ASYNC_DATABASE_URL)
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    session_maker = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    plans = []
+    try:
+        async with session_maker() as session:
+            owner = await session.scalar(select(User.id).limit(1))
+            task = await session.scalar(select(Task.id).where(Task.owner_id == owner).limit(1))
+            event.listen(engine.sync_engine, "before_cursor_execute", record)
+            await QUERY_SHAPES[shape](TaskRepository(session, None), UserRepository(session, None), owner, task)
+            event.remove(engine.sync_engine, "before_cursor_execute", record)
+            assert statements, f"{shape} did not query the database"
+
+            for sql in settings_sql:
+                await session.execute(text(sql))
+            for statement, parameters in statements:
+                connection = await session.connection()
+                raw = (await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)).scalar()
+                plan = json.loads(raw) if isinstance(raw, str) else raw
+                plans.append((statement, plan[0]["Plan"]))
+    finally:
+        await engine.dispose()
+    return plans
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shape", QUERY_SHAPES)
+async def test_query_shape_uses_index(seeded_db, shape: str):
+    """
+    Тест что запрос репозитория обслуживается индексом.
+    enable_seqscan=off делает проверку независимой от объема данных:
+    Seq Scan остается в плане, только если ни один индекс не подходит.
+    """
+    for statement, plan in await shape_plans(shape, "SET enable_seqscan = off"):
+        problems = list(full_scans(plan))
+        assert not problems, f"{shape}: {problems}\n{statement}"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("shape", ["owner_tasks", "owner_tasks_by_status"])
+async def test_owner_shape_reads_one_partition(seeded_db, shape: str):
+    """Тест что запрос по владельцу читает одну партицию tasks, а не все."""
+    scanned = False
+    for statement, plan in await shape_plans(shape):
+        partitions = {name for name in relations(plan) if name.startswith("tasks_p")}
+        assert len(partitions) <= 1, f"{shape}: {sorted(partitions)}\n{statement}"
+        scanned = scanned or bool(partitions)
+    assert scanned, f"{shape} did not read tasks"
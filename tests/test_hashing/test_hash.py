@@ -0,0 +1,67 @@
+import threading
+import asyncio
+import pytest
+
+from src.auth.hash import Hasher, hashing_pool
+from src.exc.api import ServiceUnavailableException
+from src.settings.environment import settings
+
+
+class BlockingHasher(Hasher):
+    """Хешер, который держит поток пула, пока тест его не отпустит."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def hash(self, password: str) -> str:
+        self.release.wait(timeout=10)
+        return f"hashed:{password}"
+
+    def verify(self, password: str, hashed: str) -> bool:
+        return hashed == f"hashed:{password}"
+
+
+class TestHashingPool:
+    """Группа тестов для пула хеширования паролей"""
+
+    @pytest.mark.asyncio
+    async def test_full_pool_rejects_with_503(self):
+        """Тест что при занятых потоках и полной очереди хеширование сразу получает 503 с Retry-After."""
+        hasher = BlockingHasher()
+        slots = settings.HASH_WORKERS + settings.HASH_QUEUE_SIZE
+        busy = [asyncio.create_task(hasher.hash_async(str(i))) for i in range(slots)]
+        await asyncio.sleep(0)
+        rejected = hashing_pool.rejected
+        try:
+            with pytest.raises(ServiceUnavailableException) as e:
+                await hasher.hash_async("one more")
+            assert e.value.status_code == 503
+            assert e.value.headers["Retry-After"]
+            assert hashing_pool.rejected == rejected + 1
+        finally:
+            hasher.release.set()
+            results = await asyncio.gather(*busy)
+
+        assert results == [f"hashed:{i}" for i in range(slots)]
+        assert hashing_pool.pending == 0
+        assert await hasher.hash_async("after") == "hashed:after"
+
+    @pytest.mark.asyncio
+    async def test_cancelled_callers_keep_their_slots(self):
+        """Тест что отмена ожидающих не освобождает слоты, пока хеширование в пуле не закончилось."""
+        hasher = BlockingHasher()
+        slots = settings.HASH_WORKERS + settings.HASH_QUEUE_SIZE
+        busy = [asyncio.create_task(hasher.hash_async(str(i))) for i in range(slots)]
+        await asyncio.sleep(0)
+        for task in busy:
+            task.cancel()
+        await asyncio.gather(*busy, return_exceptions=True)
+        try:
+            assert hashing_pool.pending == settings.HASH_WORKERS
+            with pytest.raises(ServiceUnavailableException):
+                await asyncio.gather(*(hasher.hash_async("again") for _ in range(slots)))
+        finally:
+            hasher.release.set()
+        while hashing_pool.pending:
+            await asyncio.sleep(0.01)
+        assert await hasher.hash_async("after") == "hashed:after"